@@ -1,8 +1,12 @@
 import os
-import requests
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
-from io import BytesIO
+import sys
+from PIL import Image, ImageDraw, ImageFilter
 import textwrap
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'shared'))  # shared modules
+from fetch import fetch_image
+from encode import save
+from fontcache import load_font
+from stars import rating_strip
 
 # Paths to fonts on your system
 #TITLE_FONT = "TiltWarp-Regular.ttf"
@@ -31,30 +35,18 @@ def read_book_data():
         
 def download_image(url):
     try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            return Image.open(BytesIO(response.content))
+        return fetch_image(url)
     except Exception:
         pass
     return None
 
-def get_star_icons(rating, assets_path="assets"):
-    full_stars = int(rating)
-    half_star = 1 if rating - full_stars >= 0.5 else 0
-    empty_stars = 5 - full_stars - half_star
-    icons = ["star_full.png"] * full_stars + ["star_half.png"] * half_star + ["star_empty.png"] * empty_stars
-    return [Image.open(os.path.join(assets_path, icon)).convert("RGBA") for icon in icons]
-
-def draw_rating(poster_img, rating, assets_path="assets", spacing=10, y_offset=30, label_font_path=TEXT_FONT):
-    stars = get_star_icons(rating, assets_path)
-    if not stars:
-        return
+def draw_rating(poster_img, rating, assets_path="assets", spacing=10, y_offset=30, label_font_path=TEXT_FONT, star_size=None):
+    strip = rating_strip(rating, assets_path, spacing, star_size)
 
     draw = ImageDraw.Draw(poster_img)
-    label_font = ImageFont.truetype(label_font_path, 16)
+    label_font = load_font(label_font_path, 16)
 
-    star_width, star_height = stars[0].size
-    total_star_width = len(stars) * star_width + (len(stars) - 1) * spacing
+    star_height = strip.height
 
     label_text = "My Rating:"
     label_bbox = label_font.getbbox(label_text)
@@ -65,12 +57,10 @@ def draw_rating(poster_img, rating, assets_path="assets", spacing=10, y_offset=3
 
     draw.text((label_x, label_y), label_text, font=label_font, fill="black")
 
-    x_start = (poster_img.width - total_star_width) // 2
+    x_start = (poster_img.width - strip.width) // 2
     y_start = label_y + label_height + 15
 
-    for i, star in enumerate(stars):
-        x = x_start + i * (star_width + spacing)
-        poster_img.paste(star, (x, y_start), star)
+    poster_img.paste(strip, (x_start, y_start), strip)
 
 def generate_book_poster(book_info, cover_img):
     poster_width, poster_height = 640, 960
@@ -112,9 +102,9 @@ def generate_book_poster(book_info, cover_img):
     draw.line([(40, separator_y), (poster_width - 40, separator_y)], fill="#e4e0d8", width=2)
 
     # Fonts
-    title_font = ImageFont.truetype(TITLE_FONT, 30)
-    sub_font = ImageFont.truetype(TEXT_FONT, 20)
-    small_font = ImageFont.truetype(TEXT_FONT, 18)
+    title_font = load_font(TITLE_FONT, 30)
+    sub_font = load_font(TEXT_FONT, 20)
+    small_font = load_font(TEXT_FONT, 18)
 
     # Metadata
     title = book_info["title"]
@@ -149,7 +139,7 @@ def generate_book_poster(book_info, cover_img):
     # Save
     safe_title = title.replace(" ", "_").replace("/", "_")[:30]
     output_path = f"{safe_title}_poster.jpg"
-    poster.save(output_path)
+    save(poster, output_path)
     print(f"Book poster saved as {output_path}")
 
 def main():
@@ -2,18 +2,21 @@ import os
 import sys
 import requests
 from imdb import IMDb
-from PIL import Image, ImageDraw, ImageFont
-from io import BytesIO
+from PIL import Image, ImageDraw
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'shared'))  # shared modules
+from fetch import fetch_image
+from encode import save
+from fontcache import load_font
+from stars import rating_strip
 
 # Fonts (update these with paths to TTF fonts on your system)
 TITLE_FONT = "TiltWarp-Regular.ttf"
 TEXT_FONT = "Poppins-Regular.ttf"
 
 def download_poster(url):
-    response = requests.get(url)
-    if response.status_code == 200:
-        return Image.open(BytesIO(response.content))
-    else:
+    try:
+        return fetch_image(url)
+    except requests.RequestException:
         return None
 
 def format_list(names, max_len=3):
@@ -46,31 +49,16 @@ def get_user_rating():
         except ValueError:
             print("Invalid input. Try again.")
 
-def get_star_icons(rating, assets_path="assets"):
-    full_stars = int(rating)
-    half_star = 1 if rating - full_stars >= 0.5 else 0
-    empty_stars = 5 - full_stars - half_star
-
-    icons = []
-    icons += ["star_full.png"] * full_stars
-    icons += ["star_half.png"] * half_star
-    icons += ["star_empty.png"] * empty_stars
-
-    return [Image.open(os.path.join(assets_path, icon)).convert("RGBA") for icon in icons]
-
-def draw_rating(poster_img, rating, assets_path="assets", spacing=10, y_offset=30, label_font_path=TEXT_FONT):
+def draw_rating(poster_img, rating, assets_path="assets", spacing=10, y_offset=30, label_font_path=TEXT_FONT, star_size=None):
     """
     Draws star icons at the bottom center of the poster image.
     """
-    stars = get_star_icons(rating, assets_path)
-    if not stars:
-        return
-        
+    strip = rating_strip(rating, assets_path, spacing, star_size)
+
     draw = ImageDraw.Draw(poster_img)
-    label_font = ImageFont.truetype(label_font_path, 16)
+    label_font = load_font(label_font_path, 16)
 
-    star_width, star_height = stars[0].size
-    total_width = len(stars) * star_width + (len(stars) - 1) * spacing
+    star_height = strip.height
 
         # Text position
     label_text = "My Rating:"
@@ -83,12 +71,10 @@ def draw_rating(poster_img, rating, assets_path="assets", spacing=10, y_offset=3
     draw.text((label_x, label_y), label_text, font=label_font, fill="black")
 
     # Stars below the text
-    x_start = (poster_img.width - total_width) // 2
+    x_start = (poster_img.width - strip.width) // 2
     y_start = label_y + label_height + 15  # a little gap between text and stars
 
-    for i, star in enumerate(stars):
-        x = x_start + i * (star_width + spacing)
-        poster_img.paste(star, (x, y_start), star)
+    poster_img.paste(strip, (x_start, y_start), strip)
 
 
 def generate_poster(movie, poster_img):
@@ -101,9 +87,9 @@ def generate_poster(movie, poster_img):
 
     draw = ImageDraw.Draw(poster)
 
-    title_font = ImageFont.truetype(TITLE_FONT, 36)
-    sub_font = ImageFont.truetype(TEXT_FONT, 20)
-    small_font = ImageFont.truetype(TEXT_FONT, 18)
+    title_font = load_font(TITLE_FONT, 36)
+    sub_font = load_font(TEXT_FONT, 20)
+    small_font = load_font(TEXT_FONT, 18)
 
     y = int(height * 0.715) + 20
     draw.text((20, y), f"{movie['title'].upper()}", font=title_font, fill="black")
@@ -129,7 +115,7 @@ def generate_poster(movie, poster_img):
     # Save final image
     movie_title = movie['title'].replace(" ", "_")
     output_path = f"{movie_title}_poster.jpg"
-    poster.save(output_path)
+    save(poster, output_path)
     print(f"Poster saved as {output_path}")
 
 def main():
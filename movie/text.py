@@ -2,18 +2,20 @@ import os
 import sys
 import requests
 from imdb import IMDb
-from PIL import Image, ImageDraw, ImageFont
-from io import BytesIO
+from PIL import Image, ImageDraw
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'shared'))  # shared modules
+from fetch import fetch_image
+from encode import save
+from fontcache import load_font
 
 # Fonts (update these with paths to TTF fonts on your system)
 TITLE_FONT = "TiltWarp-Regular.ttf"
 TEXT_FONT = "Poppins-Regular.ttf"
 
 def download_poster(url):
-    response = requests.get(url)
-    if response.status_code == 200:
-        return Image.open(BytesIO(response.content))
-    else:
+    try:
+        return fetch_image(url)
+    except requests.RequestException:
         return None
 
 def format_list(names, max_len=3):
@@ -80,9 +82,9 @@ def generate_poster(movie, poster_img):
 
     draw = ImageDraw.Draw(poster)
 
-    title_font = ImageFont.truetype(TITLE_FONT, 36)
-    sub_font = ImageFont.truetype(TEXT_FONT, 20)
-    small_font = ImageFont.truetype(TEXT_FONT, 18)
+    title_font = load_font(TITLE_FONT, 36)
+    sub_font = load_font(TEXT_FONT, 20)
+    small_font = load_font(TEXT_FONT, 18)
 
     y = int(height * 0.725) + 20
     draw.text((20, y), f"{movie['title'].upper()}", font=title_font, fill="black")
@@ -108,7 +110,7 @@ def generate_poster(movie, poster_img):
     # Save final image
     movie_title = movie['title'].replace(" ", "_")
     output_path = f"{movie_title}_poster.jpg"
-    poster.save(output_path)
+    save(poster, output_path)
     print(f"Poster saved as {output_path}")
 
 def main():
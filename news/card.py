@@ -0,0 +1,304 @@
+"""News card engine shared by every language.
+
+A card is the title, subtitle, hero image, source logo (or reference
+text) and QR code of one story. Everything that differs between
+languages (fonts, sizes, background, how the reference is shown) is a
+Theme; the theme is picked from the text with detect_language() unless
+asked for by name, and only that theme's fonts are ever loaded.
+
+The downloads go through an AssetLoader, which fetches each hero image,
+logo and QR code once. Rendering the English and Tamil cards of a story
+together therefore downloads its image and shortens its link once:
+
+    python card.py input.txt input-tam.txt
+
+writes output_image_input_en.jpg and output_image_input-tam_ta.jpg. Add
+--wrap optimal for evener titles (see linebreak.py).
+"""
+import argparse
+import os
+import sys
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import qrcode
+from PIL import Image
+
+if __name__ == "__main__":  # importers have set up sys.path already
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'shared'))  # shared modules
+
+from encode import save
+from fetch import fetch, fetch_image
+from fontcache import load_font
+from glyphcache import draw_text, text_size
+from linebreak import STRATEGIES, break_words
+from script import detect_language
+from shortener import shorten
+
+CANVAS_SIZE = 1000
+PADDING = 40
+SIDE_MARGIN = 20
+IMAGE_BOX_WIDTH = CANVAS_SIZE - 2 * SIDE_MARGIN  # almost full width
+IMAGE_BOX_HEIGHT = 420  # double height
+LOGO_HEIGHT = 40
+QR_SIZE = 100
+
+# `reference` is 'logo' (the source's logo, fetched from the Reference URL)
+# or 'text' (the Reference printed in gray)
+Theme = namedtuple('Theme', 'title_font title_size subtitle_font subtitle_size '
+                            'reference_font reference_size background reference')
+
+THEMES = {
+    'en': Theme("fonts/NoticiaText-Bold.ttf", 55, "fonts/NoticiaText-Regular.ttf", 34,
+                "fonts/Montserrat-Medium.ttf", 20, "white", 'logo'),
+    'ta': Theme("fonts/TiroTamil-Regular.ttf", 45, "fonts/NotoSansTamil-Light.ttf", 25,
+                "fonts/TiroTamil-Italic.ttf", 20, "#f2eee3", 'logo'),
+    # The earlier bin/main-qr*.py layouts
+    'en-text': Theme("fonts/Montserrat-Bold.ttf", 42, "fonts/sans-italic.ttf", 30,
+                     "fonts/Montserrat-Medium.ttf", 20, "white", 'text'),
+    'ta-text': Theme("fonts/TiroTamil-Regular.ttf", 50, "fonts/NotoSansTamil-Light.ttf", 34,
+                     "fonts/TiroTamil-Italic.ttf", 20, "white", 'text'),
+}
+
+CARD_FIELDS = ('title', 'subtitle', 'image_url', 'reference', 'link')
+
+def theme_fonts(theme):
+    """(title, subtitle, reference) fonts of a theme, loaded on first use."""
+    return (load_font(theme.title_font, theme.title_size),
+            load_font(theme.subtitle_font, theme.subtitle_size),
+            load_font(theme.reference_font, theme.reference_size))
+
+def qr_image(data, size=QR_SIZE):
+    """QR code for `data` as a size x size image, drawn at the target size.
+
+    Every module is the same whole number of pixels wide (size // modules,
+    quiet zone included); the code is centred and the rest is white.
+    """
+    qr = qrcode.QRCode(
+        version=1,  # Version 1 generates a 21x21 grid (smallest size)
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        border=4,  # Border thickness
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+
+    matrix = qr.get_matrix()  # border included
+    modules = len(matrix)
+    box = size // modules
+    if box == 0:
+        raise ValueError(f"A {modules}x{modules} QR code does not fit in {size}px")
+    pixels = bytes(0 if cell else 255 for row in matrix for cell in row)
+    code = Image.frombytes("L", (modules, modules), pixels).resize((modules * box, modules * box),
+                                                                    Image.Resampling.NEAREST)
+    img = Image.new("L", (size, size), 255)
+    offset = (size - modules * box) // 2
+    img.paste(code, (offset, offset))
+    return img
+
+def generate_qr_code(url, size=QR_SIZE):
+    # Shorten the URL (cached locally, see shortener.py)
+    short_url = shorten(url)
+    print(f"Shortened URL: {short_url}")
+    return qr_image(short_url, size)
+
+def load_hero_image(image_url):
+    try:
+        linked_img = fetch_image(image_url).convert("RGB")
+    except Exception as e:
+        raise ValueError(f"Failed to download or open image: {e}")
+
+    # Scale and crop the linked image to exactly IMAGE_BOX_WIDTH x IMAGE_BOX_HEIGHT
+    img_ratio = linked_img.width / linked_img.height
+    target_ratio = IMAGE_BOX_WIDTH / IMAGE_BOX_HEIGHT
+
+    if img_ratio > target_ratio:
+        # Image is wider: fit height
+        scale_factor = IMAGE_BOX_HEIGHT / linked_img.height
+    else:
+        # Image is taller or equal: fit width
+        scale_factor = IMAGE_BOX_WIDTH / linked_img.width
+
+    new_width = int(linked_img.width * scale_factor)
+    new_height = int(linked_img.height * scale_factor)
+
+    resized_img = linked_img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+
+    # Center crop to exact size
+    left = (new_width - IMAGE_BOX_WIDTH) // 2
+    top = (new_height - IMAGE_BOX_HEIGHT) // 2
+    return resized_img.crop((left, top, left + IMAGE_BOX_WIDTH, top + IMAGE_BOX_HEIGHT))
+
+def load_logo(reference):
+    try:
+        logo_response = fetch(reference)
+
+        content_type = logo_response.content_type
+        if not content_type.startswith("image/"):
+            raise ValueError(f"URL does not point to an image. Content-Type: {content_type}")
+
+        logo_img = Image.open(BytesIO(logo_response.content)).convert("RGBA")
+
+        # Resize proportionally to LOGO_HEIGHT
+        aspect_ratio = logo_img.width / logo_img.height
+        new_width = int(LOGO_HEIGHT * aspect_ratio)
+        return logo_img.resize((new_width, LOGO_HEIGHT), Image.Resampling.LANCZOS)
+
+    except Exception as e:
+        raise ValueError(f"Failed to download or open logo: {e}")
+
+class AssetLoader:
+    """Downloads card assets in the background, each URL once.
+
+    Every request returns a future; asking again for the same hero image,
+    logo or QR link returns the same future, so cards of one story in
+    several languages share their downloads.
+    """
+    LOADERS = {'hero': load_hero_image, 'logo': load_logo, 'qr': generate_qr_code}
+
+    def __init__(self, workers=3):
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._futures = {}
+
+    def get(self, kind, url):
+        key = (kind, url)
+        if key not in self._futures:
+            self._futures[key] = self._pool.submit(self.LOADERS[kind], url)
+        return self._futures[key]
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def read_card(input_file):
+    """Returns the card fields of an input.txt style file."""
+    with open(input_file, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+
+    card = dict.fromkeys(CARD_FIELDS)
+    for line in lines:
+        if line.startswith("Title:"):
+            card["title"] = line[len("Title:"):].strip()
+        elif line.startswith("Subtitle:"):
+            card["subtitle"] = line[len("Subtitle:"):].strip()
+        elif line.startswith("ImageURL:"):
+            card["image_url"] = line[len("ImageURL:"):].strip()
+        elif line.startswith("Reference:"):
+            card["reference"] = line[len("Reference:"):].strip()
+        elif line.startswith("Link:"):
+            card["link"] = line[len("Link:"):].strip()
+    return card
+
+def card_language(card):
+    return detect_language((card.get("title") or "") + (card.get("subtitle") or ""))
+
+def pick_theme(card, theme=None):
+    """The Theme named `theme`, or the one matching the card's language."""
+    if theme is None:
+        theme = card_language(card)
+    if theme not in THEMES:
+        raise ValueError(f"Unknown theme {theme!r}, expected one of {', '.join(THEMES)}")
+    return THEMES[theme]
+
+def draw_wrapped_text(img, text, font, max_width, y_start, color="black", align="left", mode="greedy"):
+    # Each line is shaped once for measuring and drawing (see glyphcache.py)
+    lines = break_words(text.split(), font, max_width, mode) or [""]
+    for line in lines:
+        w, h = text_size(font, line)
+        if align == "left":
+            x = PADDING
+        else:
+            x = CANVAS_SIZE - PADDING - w
+        draw_text(img, (x, y_start), line, font, color)
+        y_start += h
+    return y_start
+
+def render_card(card, theme=None, assets=None, wrap="greedy"):
+    """Renders a card (a dict of CARD_FIELDS) and returns the image.
+
+    `theme` is a THEMES name; by default it follows the card's language.
+    Pass a shared AssetLoader to reuse downloads across cards. `wrap` is
+    a linebreak.STRATEGIES name for the title and subtitle.
+    """
+    theme = pick_theme(card, theme)
+    if wrap not in STRATEGIES:
+        raise ValueError(f"Unknown wrap mode {wrap!r}, expected one of {', '.join(STRATEGIES)}")
+    if assets is None:
+        with AssetLoader() as loader:
+            return _draw_card(card, theme, loader, wrap)
+    return _draw_card(card, theme, assets, wrap)
+
+def _draw_card(card, theme, assets, wrap):
+    # Start every download at once and lay out the text while they run,
+    # so the card waits only for the slowest request
+    hero_future = assets.get('hero', card["image_url"])
+    qr_future = assets.get('qr', card["link"])
+    logo_future = assets.get('logo', card["reference"]) if theme.reference == 'logo' else None
+
+    font_title, font_subtitle, font_reference = theme_fonts(theme)
+    img = Image.new("RGB", (CANVAS_SIZE, CANVAS_SIZE), theme.background)
+
+    y = PADDING
+    y = draw_wrapped_text(img, card["title"], font_title, CANVAS_SIZE - 2 * PADDING, y, align="left",
+                          mode=wrap)
+    y += 40
+    y = draw_wrapped_text(img, card["subtitle"] or "", font_subtitle, CANVAS_SIZE - 2 * PADDING, y,
+                          color="black", align="left", mode=wrap)
+    y += 40
+
+    img.paste(hero_future.result(), (SIDE_MARGIN, y))
+    ref_y = y + IMAGE_BOX_HEIGHT + 15
+
+    # QR code on the left, the source on the right
+    img.paste(qr_future.result(), (SIDE_MARGIN, ref_y))
+    if logo_future is not None:
+        logo_img = logo_future.result()
+        logo_x = CANVAS_SIZE - SIDE_MARGIN - logo_img.width
+        img.paste(logo_img, (logo_x, ref_y), mask=logo_img)
+    elif card["reference"]:
+        w = text_size(font_reference, card["reference"])[0]
+        draw_text(img, (CANVAS_SIZE - PADDING - w, ref_y), card["reference"], font_reference, "gray")
+
+    return img
+
+def render_story(cards, themes=None, wrap="greedy"):
+    """Renders several cards of one story with shared downloads.
+
+    `cards` maps a name to a card; `themes` optionally maps the same names
+    to theme names. Returns {name: image}.
+    """
+    themes = themes or {}
+    with AssetLoader() as assets:
+        return {name: render_card(card, themes.get(name), assets, wrap) for name, card in cards.items()}
+
+def create_image_from_input(input_file, output_path="output_image.jpg", theme=None, wrap="greedy"):
+    save(render_card(read_card(input_file), theme, wrap=wrap), output_path)
+
+def main():
+    parser = argparse.ArgumentParser(description='Render news cards, sharing downloads between them.')
+    parser.add_argument('inputs', nargs='+', help='input.txt style files, e.g. one per language')
+    parser.add_argument('--theme', default=None, choices=sorted(THEMES), help='default: from the language')
+    parser.add_argument('--wrap', default='greedy', choices=sorted(STRATEGIES),
+                        help="line breaking; 'optimal' gives evener titles")
+    parser.add_argument('--output', default='output_image', help='output path prefix')
+    args = parser.parse_args()
+
+    cards = {path: read_card(path) for path in args.inputs}
+    themes = {path: args.theme or card_language(card) for path, card in cards.items()}
+    # Named after the input too, so cards sharing a theme don't overwrite each other
+    output_paths = {path: f"{args.output}_{os.path.splitext(os.path.basename(path))[0]}_{themes[path]}.jpg"
+                    for path in cards}
+    if len(set(output_paths.values())) < len(output_paths):
+        parser.error("two inputs have the same file name; rename one so their cards don't overwrite each other")
+    for path, img in render_story(cards, themes, args.wrap).items():
+        output_path = output_paths[path]
+        save(img, output_path)
+        print(f"Saved {output_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""Long-running render service for news cards.
+
+Starting a process per card spends most of its time importing PIL,
+opening fonts and setting up HTTP connections. This server does that
+once and then renders cards on request:
+
+    python server.py --port 8080            # or: --socket /tmp/news-cards.sock
+    curl -s localhost:8080/render -d @card.json > card.jpg
+    curl -s localhost:8080/metrics
+
+POST /render takes a card as JSON with the fields of input.txt:
+
+    {"title": "...", "subtitle": "...", "image_url": "...",
+     "reference": "...", "link": "...", "theme": "en", "wrap": "optimal"}
+
+and answers with the JPEG. "theme" is optional (see card.THEMES); by
+default it follows the card's language. "wrap" is optional too: a
+linebreak.STRATEGIES name, "greedy" by default. At most --concurrency cards
+render at once; up to --max-queue more wait for a slot and the rest get
+503. GET /metrics reports queue depth, in-flight renders and latency
+counters as JSON.
+
+Run it from this directory so the font paths resolve.
+"""
+import argparse
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+if __name__ == "__main__":  # importers have set up sys.path already
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'shared'))  # shared modules
+
+from card import CARD_FIELDS, THEMES, pick_theme, render_card, theme_fonts
+from encode import Encoding, encode
+from fetch import get_session
+from linebreak import STRATEGIES
+
+class Overloaded(Exception):
+    pass
+
+def card_arguments(card):
+    """Validates a JSON card; returns (card fields, theme name or None, wrap mode)."""
+    if not isinstance(card, dict):
+        raise ValueError("A card must be a JSON object")
+    missing = [field for field in ('title', 'image_url', 'reference', 'link') if not card.get(field)]
+    if missing:
+        raise ValueError(f"Missing card fields: {', '.join(missing)}")
+    fields = {field: card.get(field) or '' for field in CARD_FIELDS}
+    theme = card.get('theme')
+    pick_theme(fields, theme)  # raises ValueError for unknown themes
+    wrap = card.get('wrap') or 'greedy'
+    if wrap not in STRATEGIES:
+        raise ValueError(f"Unknown wrap mode {wrap!r}, expected one of {', '.join(STRATEGIES)}")
+    return fields, theme, wrap
+
+class RenderService:
+    """Renders cards with a bounded number running and a bounded number waiting."""
+    def __init__(self, concurrency=2, max_queue=32, encoding=Encoding('jpeg', 90)):
+        self.max_queue = max_queue
+        self.encoding = encoding
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._lock = threading.Lock()
+        self.concurrency = concurrency
+        self.started = time.time()
+        self.queued = self.in_flight = self.peak_queued = 0
+        self.rendered = self.failed = self.rejected = 0
+        self.render_seconds = self.wait_seconds = 0.0
+
+    def render(self, card):
+        """Returns the encoded card; raises ValueError for bad cards, Overloaded when full."""
+        fields, theme, wrap = card_arguments(card)
+        enqueued = time.perf_counter()
+        # Only cards that find every slot busy wait, and count, in the queue
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                if self.queued >= self.max_queue:
+                    self.rejected += 1
+                    raise Overloaded(f"{self.queued} cards already waiting")
+                self.queued += 1
+                self.peak_queued = max(self.peak_queued, self.queued)
+            self._slots.acquire()
+            with self._lock:
+                self.queued -= 1
+
+        start = time.perf_counter()
+        with self._lock:
+            self.in_flight += 1
+            self.wait_seconds += start - enqueued
+        try:
+            data, _ = encode(render_card(fields, theme, wrap=wrap), self.encoding)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        else:
+            with self._lock:
+                self.rendered += 1
+                self.render_seconds += time.perf_counter() - start
+            return data
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'uptime_seconds': round(time.time() - self.started, 1),
+                'concurrency': self.concurrency,
+                'in_flight': self.in_flight,
+                'queued': self.queued,
+                'peak_queued': self.peak_queued,
+                'max_queue': self.max_queue,
+                'rendered': self.rendered,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'mean_render_seconds': round(self.render_seconds / self.rendered, 3) if self.rendered else None,
+                'mean_wait_seconds': round(self.wait_seconds / (self.rendered + self.failed), 3)
+                                     if self.rendered + self.failed else None,
+            }
+
+class CardHandler(BaseHTTPRequestHandler):
+    def _send(self, status, body, content_type='application/json'):
+        if isinstance(body, dict):
+            body = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            self._send(200, self.server.service.metrics())
+        else:
+            self._send(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self.path != '/render':
+            self._send(404, {'error': 'not found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            if length < 0:  # rfile.read() would block until the client hangs up
+                raise ValueError(f"Invalid Content-Length: {length}")
+            card = json.loads(self.rfile.read(length) or b'null')
+            data = self.server.service.render(card)
+        except (ValueError, TypeError) as e:  # bad JSON or card, or a download that was not an image
+            self._send(400, {'error': str(e)})
+        except Overloaded as e:
+            self._send(503, {'error': f'overloaded: {e}'})
+        except Exception as e:
+            self._send(500, {'error': f'{type(e).__name__}: {e}'})
+        else:
+            self._send(200, data, 'image/jpeg')
+
+    def address_string(self):
+        # Unix socket peers have no address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def make_server(service, port=8080, host='127.0.0.1', socket_path=None):
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = UnixHTTPServer(socket_path, CardHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), CardHandler)
+    server.service = service
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve news card renders over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--socket', default=None, help='listen on this Unix socket instead of TCP')
+    parser.add_argument('--concurrency', type=int, default=2, help='cards rendered at once')
+    parser.add_argument('--max-queue', type=int, default=32, help='cards allowed to wait for a slot')
+    parser.add_argument('--quality', type=int, default=90, help='JPEG quality')
+    args = parser.parse_args()
+
+    # Open every theme's fonts and the pooled HTTP session before the first card needs them
+    for theme in THEMES.values():
+        theme_fonts(theme)
+    get_session()
+    service = RenderService(args.concurrency, args.max_queue, Encoding('jpeg', args.quality))
+    server = make_server(service, args.port, args.host, args.socket)
+    print(f"Rendering cards on {args.socket or f'http://{args.host}:{args.port}'}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Memoized URL shortening.
+
+Short links are stored in a local SQLite database keyed by (backend, long
+URL), so re-rendering a story, or rendering its English and Tamil cards,
+asks the shortening service at most once per link. The backend is picked
+with QUOTE_CREATOR_SHORTENER:
+
+    tinyurl  TinyURL through pyshorteners (the default)
+    local    deterministic offline codes under QUOTE_CREATOR_SHORT_BASE,
+             for a redirector you host yourself
+    none     keep the long URL
+
+Other backends can be added with register_backend(). The database is
+short_urls.sqlite3 in the quote-creator cache root (QUOTE_CREATOR_CACHE,
+by default ~/.cache/quote-creator), next to fetch.py's http/ cache.
+"""
+import base64
+import contextlib
+import hashlib
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DB_PATH = os.path.join(os.environ.get('QUOTE_CREATOR_CACHE',
+                                      os.path.join(os.path.expanduser('~'), '.cache', 'quote-creator')),
+                       'short_urls.sqlite3')
+DEFAULT_BACKEND = os.environ.get('QUOTE_CREATOR_SHORTENER', 'tinyurl')
+
+def _tinyurl(url):
+    import pyshorteners  # only needed when actually going online
+    return pyshorteners.Shortener().tinyurl.short(url)
+
+def _local(url):
+    base = os.environ.get('QUOTE_CREATOR_SHORT_BASE')
+    if not base:
+        raise ValueError("The local shortener needs QUOTE_CREATOR_SHORT_BASE, e.g. https://example.org/s/")
+    digest = hashlib.sha256(url.encode('utf-8')).digest()
+    code = base64.urlsafe_b64encode(digest[:6]).decode('ascii')
+    return base.rstrip('/') + '/' + code
+
+BACKENDS = {
+    'tinyurl': _tinyurl,
+    'local': _local,
+    'none': lambda url: url,
+}
+
+def register_backend(name, shorten_fn):
+    BACKENDS[name] = shorten_fn
+
+def _connect():
+    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    db = sqlite3.connect(DB_PATH, timeout=30)
+    db.execute("""CREATE TABLE IF NOT EXISTS short_urls (
+                      backend TEXT NOT NULL,
+                      url TEXT NOT NULL,
+                      short_url TEXT NOT NULL,
+                      created REAL NOT NULL,
+                      PRIMARY KEY (backend, url))""")
+    return db
+
+def shorten_many(urls, backend=None, workers=4):
+    """Returns {url: short_url}, only calling the backend for unseen URLs."""
+    backend = backend or DEFAULT_BACKEND
+    shorten_fn = BACKENDS[backend]
+    urls = list(dict.fromkeys(urls))
+
+    with contextlib.closing(_connect()) as db:
+        found = {}
+        for url in urls:
+            row = db.execute("SELECT short_url FROM short_urls WHERE backend = ? AND url = ?",
+                             (backend, url)).fetchone()
+            if row:
+                found[url] = row[0]
+
+        missing = [url for url in urls if url not in found]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(workers, len(missing))) as pool:
+                fresh = dict(zip(missing, pool.map(shorten_fn, missing)))
+            with db:
+                db.executemany("INSERT OR REPLACE INTO short_urls VALUES (?, ?, ?, ?)",
+                               [(backend, url, short, time.time()) for url, short in fresh.items()])
+            found.update(fresh)
+
+    return found
+
+def shorten(url, backend=None):
+    return shorten_many([url], backend)[url]
@@ -1,11 +1,14 @@
+import os
+import sys
 from PIL import Image, ImageDraw, ImageFont
-import requests
 import random
 import textwrap
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'shared'))  # shared modules
+from fetch import fetch_image
 
 # create image object with random background
-img_url = requests.get('https://picsum.photos/800/800').url
-img = Image.open(requests.get(img_url, stream=True).raw)
+# picsum serves a different photo every time, so skip the disk cache
+img = fetch_image('https://picsum.photos/800/800', cache=False)
 
 # function to draw text on image
 def draw_text(text, subtext):
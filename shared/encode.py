@@ -0,0 +1,150 @@
+"""Image encoding: codecs, file-size targeting and background encoding.
+
+    save(img, 'out.jpg')                                   # progressive JPEG, default quality
+    save(img, 'out.webp', Encoding('webp', target_bytes=200_000))
+
+An Encoding names a codec (jpeg, webp, avif or png) and either a fixed
+quality or a target file size. With a target the quality is binary
+searched for the best one that fits, which takes a handful of trial
+encodes; images already under the target at the top quality cost one.
+PNG is lossless and ignores both.
+
+Encoding a 1080x1920 image takes about as long as rendering it, so
+BackgroundEncoder runs encodes on a worker thread (Pillow releases the
+GIL while encoding) and the next render overlaps the previous encode.
+
+AVIF needs a Pillow built with libavif, or the pillow-avif-plugin package.
+"""
+import io
+import os
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+Codec = namedtuple('Codec', 'pil_format extension quality options plugin')
+
+CODECS = {
+    'jpeg': Codec('JPEG', '.jpg', 85, {'progressive': True, 'optimize': True, 'subsampling': '4:2:0'}, None),
+    'webp': Codec('WEBP', '.webp', 80, {'method': 4}, None),
+    'avif': Codec('AVIF', '.avif', 60, {'speed': 6}, 'pillow_avif'),
+    'png': Codec('PNG', '.png', None, {'compress_level': 6}, None),  # lossless: no quality
+}
+
+EXTENSIONS = {'.jpg': 'jpeg', '.jpeg': 'jpeg', '.webp': 'webp', '.avif': 'avif', '.png': 'png'}
+
+# Quality range searched when aiming at a file size
+MIN_QUALITY, MAX_QUALITY = 20, 95
+
+class Encoding(namedtuple('Encoding', 'format quality target_bytes', defaults=('jpeg', None, None))):
+    """How to encode: a codec name plus a fixed quality or a file-size budget in bytes.
+
+    With a budget, `quality` (if given) caps the search.
+    """
+    @property
+    def codec(self):
+        return CODECS[self.format]
+
+    @property
+    def extension(self):
+        return self.codec.extension
+
+DEFAULT_ENCODING = Encoding()
+
+def encoding_for(path):
+    """The default Encoding for a file name, from its extension.
+
+    Unknown extensions get JPEG, which is what the renderers always wrote.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    return Encoding(EXTENSIONS[extension]) if extension in EXTENSIONS else DEFAULT_ENCODING
+
+def available(name):
+    """True if this Pillow can write the named codec."""
+    codec = CODECS[name]
+    if codec.plugin:
+        try:
+            __import__(codec.plugin)  # registers the codec with Pillow
+        except ImportError:
+            pass
+    Image.init()
+    return codec.pil_format in Image.SAVE
+
+def _encode(image, codec, quality):
+    buffer = io.BytesIO()
+    options = codec.options if quality is None else dict(codec.options, quality=quality)
+    image.save(buffer, codec.pil_format, **options)
+    return buffer.getvalue()
+
+def encode(image, encoding=DEFAULT_ENCODING):
+    """Returns (data, quality) for `image` encoded as `encoding` asks; quality is None for PNG."""
+    codec = encoding.codec
+    if not available(encoding.format):
+        raise ValueError(f"This Pillow cannot write {encoding.format.upper()} images")
+    if codec.pil_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    if codec.quality is None:  # lossless, nothing to tune
+        return _encode(image, codec, None), None
+
+    if encoding.target_bytes is None:
+        quality = encoding.quality or codec.quality
+        return _encode(image, codec, quality), quality
+
+    # Largest quality whose output fits; size grows with quality, so bisect
+    low, high = MIN_QUALITY, encoding.quality or MAX_QUALITY
+    best = None
+    while low <= high:
+        quality = (low + high) // 2
+        data = _encode(image, codec, quality)
+        if len(data) <= encoding.target_bytes:
+            best = data, quality
+            low = quality + 1
+        else:
+            high = quality - 1
+    # Nothing fits: the smallest file is the closest we can get
+    return best or (_encode(image, codec, MIN_QUALITY), MIN_QUALITY)
+
+def save(image, path, encoding=None):
+    """Encodes `image` to `path` (atomically) and returns the path.
+
+    Without an explicit encoding, the codec follows the file extension.
+    """
+    data, _ = encode(image, encoding or encoding_for(path))
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return path
+
+class BackgroundEncoder:
+    """Saves images on a worker thread while the caller renders the next ones.
+
+    At most `max_pending` images wait to be encoded; submit() blocks on the
+    oldest beyond that, so rendering cannot run arbitrarily far ahead.
+    Encoding errors surface from submit() or close().
+    """
+    def __init__(self, encoding=None, max_pending=2):
+        self.encoding = encoding
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='encode')
+        self._pending = deque()
+
+    def submit(self, image, path, encoding=None):
+        while len(self._pending) >= self.max_pending:
+            self._pending.popleft().result()
+        future = self._pool.submit(save, image, path, encoding or self.encoding)
+        self._pending.append(future)
+        return future
+
+    def close(self):
+        try:
+            while self._pending:
+                self._pending.popleft().result()
+        finally:
+            self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,118 @@
+"""Shared HTTP fetch layer.
+
+All downloads go through one keep-alive session with retries and backoff,
+and through a content-addressed disk cache: bodies are stored under the
+SHA-256 of their content and indexed by URL along with the ETag and
+Last-Modified validators the server sent. A URL that is already cached is
+served from disk without any network round trip; with revalidate=True a
+conditional request is made instead and a 304 reuses the cached body.
+
+The cache lives in http/ under the quote-creator cache root,
+~/.cache/quote-creator unless QUOTE_CREATOR_CACHE points somewhere else
+(the URL shortener keeps its database in the same root).
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import namedtuple
+from io import BytesIO
+
+import requests
+from PIL import Image
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+CACHE_ROOT = os.environ.get('QUOTE_CREATOR_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'quote-creator'))
+CACHE_DIR = os.path.join(CACHE_ROOT, 'http')
+TIMEOUT = 10
+
+Fetched = namedtuple('Fetched', 'content content_type url from_cache')
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """Returns the process-wide pooled session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                          allowed_methods=frozenset(['GET', 'HEAD']))
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retry)
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers['User-Agent'] = 'quote-creator'
+            _session = session
+    return _session
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+def _index_path(url):
+    key = _digest(url.encode('utf-8'))
+    return os.path.join(CACHE_DIR, 'index', key[:2], key + '.json')
+
+def _object_path(digest):
+    return os.path.join(CACHE_DIR, 'objects', digest[:2], digest)
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def _read_cached(url):
+    try:
+        with open(_index_path(url), 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        with open(_object_path(entry['sha256']), 'rb') as f:
+            return entry, f.read()
+    except (OSError, ValueError, KeyError):
+        return None, None
+
+def _store(url, response):
+    digest = _digest(response.content)
+    object_path = _object_path(digest)
+    if not os.path.exists(object_path):
+        _write_atomic(object_path, response.content)
+    entry = {
+        'url': response.url,
+        'sha256': digest,
+        'content_type': response.headers.get('Content-Type', ''),
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+    }
+    _write_atomic(_index_path(url), json.dumps(entry).encode('utf-8'))
+
+def fetch(url, timeout=TIMEOUT, cache=True, revalidate=False):
+    """Downloads `url`, going through the disk cache unless cache=False.
+
+    Raises requests.RequestException on network errors and non-2xx replies.
+    """
+    entry = content = None
+    if cache:
+        entry, content = _read_cached(url)
+        if entry and not revalidate:
+            return Fetched(content, entry['content_type'], entry['url'], True)
+
+    headers = {}
+    if entry and entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry and entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+
+    response = get_session().get(url, headers=headers, timeout=timeout)
+    if entry and response.status_code == 304:
+        return Fetched(content, entry['content_type'], entry['url'], True)
+    response.raise_for_status()
+
+    if cache:
+        _store(url, response)
+    return Fetched(response.content, response.headers.get('Content-Type', ''), response.url, False)
+
+def fetch_image(url, **kwargs):
+    """Downloads `url` and opens it as a PIL image."""
+    return Image.open(BytesIO(fetch(url, **kwargs).content))
@@ -0,0 +1,25 @@
+"""Process-wide font registry.
+
+Parsing a TTF file is much slower than drawing with it, so every renderer
+loads fonts through load_font() and gets back the same FreeTypeFont object
+for a given (path, size, layout engine) for the life of the process.
+"""
+from functools import lru_cache
+
+from PIL import ImageFont
+
+@lru_cache(maxsize=128)
+def load_font(path, size, layout_engine=None):
+    """Returns a cached FreeTypeFont, loading it on first use."""
+    return ImageFont.truetype(path, size, layout_engine=layout_engine)
+
+def preload_fonts(font_tables, sizes, layout_engine=None):
+    """Loads every font in the given {lang: [paths]} tables at every size."""
+    for table in font_tables:
+        for paths in table.values():
+            for path in set(paths):
+                for size in sizes:
+                    load_font(path, size, layout_engine)
+
+def font_cache_info():
+    return load_font.cache_info()
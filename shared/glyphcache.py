@@ -0,0 +1,110 @@
+"""Process-wide cache of shaped text runs.
+
+Every getbbox/getlength/text call on a complex script such as Tamil runs
+the text through the shaper again, and the same lines are measured for
+layout, drawn, and often repeated across outputs (author names, the same
+quote in a batch). This module shapes a (font, text) run once and keeps
+its metrics, and its rasterized coverage mask once it is first drawn.
+Drawing a cached run is then a single paste of the mask.
+
+Fonts are keyed by object, which is stable because every renderer loads
+them through fontcache.load_font() (or script.pick_font() for mixed
+text). Run this module from status-creator/ to compare cold and warm
+costs:
+
+    python ../shared/glyphcache.py --font Notoserif.ttf --size 72
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+from PIL import Image, ImageDraw
+
+# bbox is relative to the drawing origin, as font.getbbox() returns it
+GlyphRun = namedtuple('GlyphRun', 'advance bbox')
+
+@lru_cache(maxsize=4096)
+def glyph_run(font, text):
+    """Returns the cached advance and bounding box of `text` in `font`."""
+    return GlyphRun(font.getlength(text), font.getbbox(text))
+
+@lru_cache(maxsize=256)
+def run_mask(font, text):
+    """Returns the run's 8-bit coverage mask, covering exactly its bounding box."""
+    left, top, right, bottom = glyph_run(font, text).bbox
+    mask = Image.new('L', (max(right - left, 0), max(bottom - top, 0)))
+    draw = ImageDraw.Draw(mask)
+    if hasattr(font, 'runs'):  # script.ScriptFont: every run in its own font, on one baseline
+        for run_font, run, x in font.runs(text):
+            draw.text((x - left, font.ascent - top), run, font=run_font, fill=255, anchor='ls')
+    else:
+        draw.text((-left, -top), text, font=font, fill=255)
+    return mask
+
+def text_size(font, text):
+    """(width, height) of `text` as draw.textbbox((0, 0), ...) reports them."""
+    return glyph_run(font, text).bbox[2:]
+
+def draw_text(image, xy, text, font, fill):
+    """Counterpart of ImageDraw.text(xy, text, font=font, fill=fill) using cached runs."""
+    left, top, right, bottom = glyph_run(font, text).bbox
+    if right <= left or bottom <= top:
+        return
+    x, y = int(round(xy[0])), int(round(xy[1]))
+    image.paste(fill, (x + left, y + top), run_mask(font, text))
+
+def glyph_cache_info():
+    return {'runs': glyph_run.cache_info(), 'masks': run_mask.cache_info()}
+
+def clear_glyph_cache():
+    glyph_run.cache_clear()
+    run_mask.cache_clear()
+
+SAMPLE_TEXT = ("அகர முதல எழுத்தெல்லாம் ஆதி பகவன் முதற்றே உலகு "
+               "கற்றதனால் ஆய பயனென்கொல் வாலறிவன் நற்றாள் தொழாஅர் எனின்")
+
+def _benchmark():
+    import argparse
+    import time
+
+    from fontcache import load_font
+
+    parser = argparse.ArgumentParser(description='Compare cold and warm text shaping and drawing.')
+    parser.add_argument('--font', default='Notoserif.ttf')
+    parser.add_argument('--size', type=int, default=72)
+    parser.add_argument('--text', default=SAMPLE_TEXT, help='words to measure and draw, one run per word')
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    font = load_font(args.font, args.size)
+    words = args.text.split()
+    canvas = Image.new('RGB', (args.size * 40, args.size * 2), 'white')
+    draw = ImageDraw.Draw(canvas)
+
+    def uncached():
+        # What the renderers did before: measure twice, then draw
+        for word in words:
+            draw.textbbox((0, 0), word, font=font)
+            font.getlength(word)
+            draw.text((10, 10), word, font=font, fill=(50, 50, 50))
+
+    def cached():
+        for word in words:
+            text_size(font, word)
+            glyph_run(font, word).advance
+            draw_text(canvas, (10, 10), word, font, (50, 50, 50))
+
+    def timed(fn, rounds):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            fn()
+        return (time.perf_counter() - start) / (rounds * len(words)) * 1e6
+
+    print(f"{len(words)} runs at {args.size}px in {args.font}, microseconds per run:")
+    print(f"  uncached            {timed(uncached, args.rounds):8.1f}")
+    clear_glyph_cache()
+    print(f"  cached, cold        {timed(cached, 1):8.1f}")
+    print(f"  cached, warm        {timed(cached, args.rounds):8.1f}")
+    print(f"  {glyph_cache_info()}")
+
+if __name__ == "__main__":
+    _benchmark()
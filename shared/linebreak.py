@@ -0,0 +1,104 @@
+"""Line breaking with memoized word widths.
+
+Every word is measured once per font and a line's width is composed by
+adding word and space advances, so wrapping a paragraph costs one shaping
+call per distinct word instead of one per word per candidate line. The
+composed width ignores kerning and shaping across the joining spaces, so
+each finished line is measured once for real and pulled back if it
+overflows.
+
+Two strategies are available: 'greedy' fills each line as far as it goes
+(the classic behaviour), 'optimal' minimises the squared slack of every
+line but the last, Knuth-Plass style, which gives evener paragraphs.
+"""
+from bisect import bisect_right
+from functools import lru_cache
+
+from glyphcache import glyph_run
+
+@lru_cache(maxsize=16384)
+def word_width(font, word):
+    """Returns the cached advance width of `word` in `font`."""
+    return font.getlength(word)
+
+def _offsets(font, words):
+    # offsets[k] is the width of words[:k] with a trailing space after each,
+    # so words[i:j] joined by spaces is offsets[j] - offsets[i] - space wide.
+    space = word_width(font, ' ')
+    offsets = [0.0]
+    for word in words:
+        offsets.append(offsets[-1] + word_width(font, word) + space)
+    return offsets, space
+
+def _fit(font, words, i, j, max_width):
+    """Shrinks words[i:j] until its real, shaped width fits max_width."""
+    # Via the glyph-run cache, so the accepted line is already shaped when it is drawn
+    while j > i + 1 and glyph_run(font, ' '.join(words[i:j])).advance > max_width:
+        j -= 1
+    return j
+
+def _greedy(font, words, max_width):
+    offsets, space = _offsets(font, words)
+    breaks = []
+    i = 0
+    while i < len(words):
+        # Largest j with offsets[j] - offsets[i] - space <= max_width, but
+        # always at least one word so overlong words get a line of their own.
+        j = bisect_right(offsets, offsets[i] + space + max_width, i + 1) - 1
+        j = _fit(font, words, i, max(j, i + 1), max_width)
+        breaks.append((i, j))
+        i = j
+    return breaks
+
+def _optimal(font, words, max_width):
+    offsets, space = _offsets(font, words)
+    n = len(words)
+    cost = [0.0] + [float('inf')] * n
+    previous = [0] * (n + 1)
+    for j in range(1, n + 1):
+        for i in range(j - 1, -1, -1):
+            width = offsets[j] - offsets[i] - space
+            if width > max_width and i < j - 1:
+                break
+            slack = 0.0 if j == n else max(max_width - width, 0.0)
+            candidate = cost[i] + slack * slack
+            if candidate < cost[j]:
+                cost[j] = candidate
+                previous[j] = i
+
+    breaks = []
+    j = n
+    while j > 0:
+        breaks.append((previous[j], j))
+        j = previous[j]
+    breaks.reverse()
+
+    corrected = []
+    for i, j in breaks:
+        if _fit(font, words, i, j, max_width) == j:
+            corrected.append((i, j))
+        else:
+            # Kerning pushed the line over; re-break just these words.
+            corrected.extend((i + a, i + b) for a, b in _greedy(font, words[i:j], max_width))
+    return corrected
+
+STRATEGIES = {
+    'greedy': _greedy,
+    'optimal': _optimal,
+}
+
+def break_words(words, font, max_width, mode='greedy'):
+    """Splits a list of words into lines no wider than max_width."""
+    breaks = STRATEGIES[mode](font, words, max_width)
+    return [' '.join(words[i:j]) for i, j in breaks]
+
+def wrap_text(text, font, max_width, mode='greedy'):
+    """Wraps every paragraph of `text`, keeping empty lines."""
+    lines = []
+    for paragraph in text.split('\n'):
+        words = paragraph.split()
+        if words:
+            lines.extend(break_words(words, font, max_width, mode))
+        else:  # Preserve empty lines
+            lines.append("")
+    return lines
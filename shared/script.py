@@ -0,0 +1,182 @@
+"""Script detection and per-script fonts for mixed Tamil/English text.
+
+segment() splits a text into runs of one script with a single regex
+pass. Spaces, digits and punctuation between two Tamil words stay in the
+Tamil run, so a Tamil phrase is shaped in one piece; anywhere else they
+go with the surrounding Latin text. A run with no letters at all (say, a
+year on its own) takes the caller's default script.
+
+pick_font() chooses a font per script from a renderer's TEXT_FONTS or
+NAME_FONTS table. Text in one script gets that script's font as before;
+mixed text gets a ScriptFont, which measures and draws every run in its
+own font on a shared baseline and otherwise behaves like a FreeTypeFont,
+so line breaking, layout and the glyph cache need no second pass.
+
+Run this module to measure detection and segmentation throughput:
+
+    python shared/script.py --quotes 100000
+"""
+import math
+import random
+import re
+from functools import lru_cache
+
+from fontcache import load_font
+
+TAMIL = '\u0B80-\u0BFF'
+
+_TAMIL_CHAR = re.compile(f'[{TAMIL}]')
+# A Tamil run, with any neutral characters between its words, or a run of anything else
+_NEUTRAL = f'(?:(?![{TAMIL}])[\\W\\d_])'
+_SCRIPT_RUN = re.compile(f'[{TAMIL}]+(?:{_NEUTRAL}+[{TAMIL}]+)*|[^{TAMIL}]+')
+_LETTER = re.compile(r'[^\W\d_]')
+
+def detect_language(text):
+    """'ta' if the text has any Tamil in it, else 'en'."""
+    return 'ta' if _TAMIL_CHAR.search(text) else 'en'
+
+def segment(text, default='en'):
+    """Returns [(script, run)] covering `text`, with script 'ta' or 'en'."""
+    runs = []
+    for match in _SCRIPT_RUN.finditer(text):
+        run = match.group()
+        if _TAMIL_CHAR.match(run):
+            script = 'ta'
+        else:
+            script = 'en' if _LETTER.search(run) else default
+        if runs and runs[-1][0] == script:
+            runs[-1] = (script, runs[-1][1] + run)
+        else:
+            runs.append((script, run))
+    return runs
+
+def scripts_in(text, default='en'):
+    """The scripts of `text` in order of first appearance."""
+    return list(dict.fromkeys(script for script, _ in segment(text, default))) or [default]
+
+class ScriptFont:
+    """Draws each script run of a text in its own font, like one font would.
+
+    Provides what the renderers use of a FreeTypeFont: getlength(),
+    getbbox() and getmetrics(). Boxes are relative to the top-left ('la')
+    origin of the default script's font; the other fonts share its baseline.
+    """
+    def __init__(self, fonts, default='en'):
+        self.fonts = dict(fonts)
+        self.default = default if default in self.fonts else next(iter(self.fonts))
+        self.ascent = self.fonts[self.default].getmetrics()[0]
+
+    def runs(self, text):
+        """Yields (font, run, x) for every script run, x being its advance from the origin."""
+        x = 0.0
+        for script, run in segment(text, self.default):
+            font = self.fonts.get(script, self.fonts[self.default])
+            yield font, run, x
+            x += font.getlength(run)
+
+    def getlength(self, text):
+        return sum(font.getlength(run) for font, run, _ in self.runs(text))
+
+    def getbbox(self, text):
+        boxes = []
+        for font, run, x in self.runs(text):
+            left, top, right, bottom = font.getbbox(run, anchor='ls')
+            boxes.append((x + left, self.ascent + top, x + right, self.ascent + bottom))
+        if not boxes:
+            return 0, 0, 0, 0
+        return (math.floor(min(box[0] for box in boxes)), min(box[1] for box in boxes),
+                math.ceil(max(box[2] for box in boxes)), max(box[3] for box in boxes))
+
+    def getmetrics(self):
+        metrics = [font.getmetrics() for font in self.fonts.values()]
+        return max(ascent for ascent, _ in metrics), max(descent for _, descent in metrics)
+
+@lru_cache(maxsize=128)
+def _script_font(fonts, default):
+    # One object per font combination, so caches keyed by font keep hitting
+    return ScriptFont(fonts, default)
+
+def pick_font(text, fonts, size, rng=random, default='en'):
+    """Loads the font for `text` from a list of paths or a {script: [paths]} table.
+
+    With a table, one font is drawn from `rng` per script the text uses, in
+    order of appearance; text in a single script gets a plain FreeTypeFont.
+    """
+    if not isinstance(fonts, dict):
+        return load_font(rng.choice(fonts), size)
+    chosen = tuple((script, load_font(rng.choice(fonts[script]), size)) for script in scripts_in(text, default))
+    if len(chosen) == 1:
+        return chosen[0][1]
+    return _script_font(chosen, default)
+
+def font_at(font, size):
+    """The same font, or ScriptFont, at another size (through the font cache)."""
+    if isinstance(font, ScriptFont):
+        return _script_font(tuple((script, font_at(f, size)) for script, f in font.fonts.items()), font.default)
+    return load_font(font.path, size)
+
+def _detect_language_loop(text):
+    # The per-character scan the renderers used before
+    for c in text:
+        if '\u0B80' <= c <= '\u0BFF':
+            return 'ta'
+    return 'en'
+
+ENGLISH_WORDS = "the light of learning is the first of all letters as the world begins with god".split()
+TAMIL_WORDS = "அகர முதல எழுத்தெல்லாம் ஆதி பகவன் முதற்றே உலகு கற்றதனால் ஆய பயனென்கொல்".split()
+
+def synthetic_corpus(count, rng, words=20):
+    """Yields `count` quotes: 40% English, 40% Tamil and 20% mixed, English first."""
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.4:
+            vocabulary = ENGLISH_WORDS
+        elif kind < 0.8:
+            vocabulary = TAMIL_WORDS
+        else:
+            vocabulary = ENGLISH_WORDS + TAMIL_WORDS
+        chosen = rng.choices(vocabulary, k=words)
+        if vocabulary is not TAMIL_WORDS:
+            chosen.sort(key=lambda word: word in TAMIL_WORDS)
+        yield ' '.join(chosen) + '.'
+
+def _benchmark():
+    import argparse
+    import os
+    import sys
+    import time
+
+    parser = argparse.ArgumentParser(description='Measure script detection and segmentation throughput.')
+    parser.add_argument('--quotes', type=int, default=100000, help='size of the synthetic corpus')
+    parser.add_argument('--corpus', default=None,
+                        help='JSONL file or directory of quotes to use instead (see status-creator/batch.py)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.corpus:
+        # The corpus is read as batch.py reads it
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'status-creator'))
+        from batch import read_corpus
+        from plan import parse_input
+        quotes = [body for _, body, _, error in read_corpus(args.corpus, parse_input) if not error]
+    else:
+        quotes = list(synthetic_corpus(args.quotes, random.Random(args.seed)))
+
+    def timed(fn, *columns):
+        calls = list(zip(quotes, *columns))
+        start = time.perf_counter()
+        for call in calls:
+            fn(*call)
+        return len(calls) / (time.perf_counter() - start)
+
+    # Each quote's own language is the default script, as in the renderers,
+    # so digit- or punctuation-only runs do not count a Tamil quote as mixed
+    langs = [detect_language(quote) for quote in quotes]
+    mixed = sum(len(scripts_in(quote, lang)) > 1 for quote, lang in zip(quotes, langs))
+    print(f"{len(quotes)} quotes ({mixed} mixed), quotes per second:")
+    print(f"  character loop      {timed(_detect_language_loop):12,.0f}")
+    print(f"  regex detection     {timed(detect_language):12,.0f}")
+    print(f"  segmentation        {timed(segment, langs):12,.0f}")
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,174 @@
+"""Cached star-rating strips.
+
+A rating is always five stars, each full, half or empty, so there are only
+eleven distinct strips. Each one is composited once per (assets path,
+spacing, star size, color) from stars that are themselves made once, and
+drawing a rating becomes a single alpha paste.
+
+At the default size the shipped PNG icons are used as they are. Any other
+size (or color) is drawn from the polygon geometry in the matching SVG
+file, so high-DPI and thumbnail posters need no hand-converted PNGs.
+"""
+import os
+import re
+from functools import lru_cache
+
+from PIL import Image, ImageChops, ImageDraw
+
+STAR_ICONS = {
+    'full': "star_full.png",
+    'half': "star_half.png",
+    'empty': "star_empty.png",
+}
+
+SVG_ICONS = {
+    'full': "star_full.svg",
+    'half': "star_half.svg",
+    'empty': "star_empty.svg",
+}
+
+_PATH_TOKEN = re.compile(r'[MmLlHhVvCcSsZz]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+
+def _cubic(p0, p1, p2, p3, steps):
+    points = []
+    for i in range(1, steps + 1):
+        t = i / steps
+        u = 1 - t
+        points.append((u**3 * p0[0] + 3 * u*u*t * p1[0] + 3 * u*t*t * p2[0] + t**3 * p3[0],
+                       u**3 * p0[1] + 3 * u*u*t * p1[1] + 3 * u*t*t * p2[1] + t**3 * p3[1]))
+    return points
+
+def parse_svg_path(d, steps=16):
+    """Flattens SVG path data (M, L, H, V, C, S, Z) into a list of polygons."""
+    tokens = _PATH_TOKEN.findall(d)
+    polygons, points = [], []
+    x = y = 0.0
+    start = (0.0, 0.0)
+    control = None
+    command = None
+    i = 0
+
+    def number():
+        nonlocal i
+        if i >= len(tokens) or tokens[i].isalpha():
+            raise ValueError(f"Malformed SVG path near token {i}")
+        i += 1
+        return float(tokens[i - 1])
+
+    while i < len(tokens):
+        if tokens[i].isalpha():
+            command = tokens[i]
+            i += 1
+        elif command is None:
+            raise ValueError(f"SVG path data without a command at token {i}")
+
+        kind = command.upper()
+        ox, oy = (x, y) if command.islower() else (0.0, 0.0)
+        if kind == 'M':
+            if len(points) > 2:
+                polygons.append(points)
+            x, y = ox + number(), oy + number()
+            points = [(x, y)]
+            start = (x, y)
+            command = 'l' if command.islower() else 'L'  # further pairs are line-tos
+            control = None
+        elif kind == 'L':
+            x, y = ox + number(), oy + number()
+            points.append((x, y))
+            control = None
+        elif kind == 'H':
+            x = ox + number()
+            points.append((x, y))
+            control = None
+        elif kind == 'V':
+            y = oy + number()
+            points.append((x, y))
+            control = None
+        elif kind in 'CS':
+            if kind == 'C':
+                c1 = (ox + number(), oy + number())
+            else:  # reflect the previous control point
+                c1 = (2 * x - control[0], 2 * y - control[1]) if control else (x, y)
+            c2 = (ox + number(), oy + number())
+            end = (ox + number(), oy + number())
+            points.extend(_cubic((x, y), c1, c2, end, steps))
+            control = c2
+            x, y = end
+        elif kind == 'Z':
+            if len(points) > 2:
+                polygons.append(points)
+            points = []
+            x, y = start
+            control = None
+            command = None
+    if len(points) > 2:
+        polygons.append(points)
+    return polygons
+
+@lru_cache(maxsize=None)
+def load_star_shape(kind, assets_path="assets"):
+    """Returns ((viewbox width, viewbox height), polygons) for a star SVG."""
+    with open(os.path.join(assets_path, SVG_ICONS[kind]), 'r', encoding='utf-8') as f:
+        svg = f.read()
+    viewbox = [float(v) for v in re.search(r'viewBox="([^"]+)"', svg).group(1).replace(',', ' ').split()]
+    polygons = []
+    for d in re.findall(r'\sd="([^"]+)"', svg):
+        polygons.extend(parse_svg_path(d))
+    return (viewbox[2], viewbox[3]), [[(px - viewbox[0], py - viewbox[1]) for px, py in polygon] for polygon in polygons]
+
+@lru_cache(maxsize=256)
+def render_star(kind, size, color="black", assets_path="assets", supersample=4):
+    """Rasterizes a star from its SVG geometry at `size` = (width, height).
+
+    Subpaths are combined even-odd, which is how the outline and half stars
+    cut their holes, and edges are anti-aliased by supersampling.
+    """
+    (view_width, view_height), polygons = load_star_shape(kind, assets_path)
+    big = (size[0] * supersample, size[1] * supersample)
+    scale_x, scale_y = big[0] / view_width, big[1] / view_height
+
+    mask = Image.new("1", big, 0)
+    for polygon in polygons:
+        layer = Image.new("1", big, 0)
+        ImageDraw.Draw(layer).polygon([(px * scale_x, py * scale_y) for px, py in polygon], fill=1)
+        mask = ImageChops.logical_xor(mask, layer)
+
+    star = Image.new("RGBA", size, color)
+    star.putalpha(mask.convert("L").resize(size, Image.Resampling.BOX))
+    return star
+
+def star_kinds(rating):
+    """Returns the five star kinds for a rating, rounded down to a half step."""
+    full_stars = int(rating)
+    half_star = 1 if rating - full_stars >= 0.5 else 0
+    empty_stars = 5 - full_stars - half_star
+    return ('full',) * full_stars + ('half',) * half_star + ('empty',) * empty_stars
+
+@lru_cache(maxsize=None)
+def _load_png_star(kind, assets_path):
+    return Image.open(os.path.join(assets_path, STAR_ICONS[kind])).convert("RGBA")
+
+def load_star(kind, assets_path="assets", size=None, color=None):
+    """Returns a cached star: the PNG icon by default, else drawn from the SVG."""
+    if size is None and color is None:
+        return _load_png_star(kind, assets_path)
+    size = tuple(size) if size else _load_png_star(kind, assets_path).size
+    return render_star(kind, size, color or "black", assets_path)
+
+@lru_cache(maxsize=64)
+def _composite_strip(kinds, assets_path, spacing, size, color):
+    stars = [load_star(kind, assets_path, size, color) for kind in kinds]
+    star_width, star_height = stars[0].size
+    strip_width = len(stars) * star_width + (len(stars) - 1) * spacing
+    strip = Image.new("RGBA", (strip_width, star_height), (0, 0, 0, 0))
+    for i, star in enumerate(stars):
+        strip.paste(star, (i * (star_width + spacing), 0))
+    return strip
+
+def rating_strip(rating, assets_path="assets", spacing=10, size=None, color=None):
+    """Returns the cached RGBA strip of five stars for `rating`.
+
+    `size` = (width, height) and `color` switch to vector-drawn stars. The
+    strip is shared, so paste it rather than drawing on it.
+    """
+    return _composite_strip(star_kinds(rating), assets_path, spacing, tuple(size) if size else None, color)
@@ -0,0 +1,221 @@
+"""Render a whole quote corpus in one run.
+
+The corpus is either a JSONL file (one quote per line, with "body"/"author"
+fields or a raw "text" field in input.txt format, plus an optional "id") or
+a directory of input.txt style .txt files. Every quote is rendered as a
+WhatsApp status and a square image by a pool of worker processes, each of
+which imports the renderer once and keeps it warm for the whole run.
+
+Run it from this directory so the font paths resolve:
+
+    python batch.py quotes.jsonl output --workers 4
+"""
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+if __name__ == "__main__":  # importers have set up sys.path already
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'shared'))  # shared modules
+
+from encode import CODECS, DEFAULT_ENCODING, Encoding
+from fontcache import preload_fonts
+from layout import font_sizes
+from linebreak import STRATEGIES
+from plan import NAME_FONTS, TEXT_FONTS, make_plan, parse_input
+from script import detect_language
+
+SIZES = {
+    'wa': (1080, 1920),  # WhatsApp Status
+    'sq': (1080, 1080),  # Twitter Square
+}
+
+_renderer = None
+
+def _check_quote(body, author):
+    """Raises ValueError unless body is non-empty text and author is text."""
+    if not isinstance(body, str) or not body.strip():
+        raise ValueError(f"quote body must be non-empty text, got {body!r}")
+    if not isinstance(author, str):
+        raise ValueError(f"quote author must be text, got {author!r}")
+
+def read_corpus(source, parse_input):
+    """Yields (job_id, body, author, error) for every quote in a JSONL file or directory.
+
+    A record that cannot be read, or whose body is empty or author is not
+    text, comes back with body and author None and the reason in `error`,
+    so one bad line does not end the run.
+    """
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            path = os.path.join(source, name)
+            if not name.endswith('.txt') or not os.path.isfile(path):
+                continue
+            job_id = os.path.splitext(name)[0]
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    body, author = parse_input(f.read())
+                _check_quote(body, author)
+            except (OSError, ValueError) as e:
+                yield job_id, None, None, f'{type(e).__name__}: {e}'
+                continue
+            yield job_id, body, author, None
+        return
+
+    # Bytes, so a line that is not UTF-8 fails on its own in json.loads
+    with open(source, 'rb') as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            job_id = str(number)
+            try:
+                record = json.loads(line)
+                job_id = str(record.get('id', number)).replace(os.sep, '_')
+                if 'text' in record:
+                    body, author = parse_input(record['text'])
+                elif 'body' in record:
+                    body, author = record['body'], record.get('author', '')
+                else:
+                    raise ValueError("record has neither a 'text' nor a 'body' field")
+                _check_quote(body, author)
+            except (ValueError, AttributeError, TypeError) as e:  # bad JSON, or not a quote object
+                yield job_id, None, None, f'{type(e).__name__}: {e}'
+                continue
+            yield job_id, body, author, None
+
+def _init_worker(style):
+    global _renderer
+    _renderer = importlib.import_module(style)
+    for size in SIZES.values():
+        text_size, name_size, _ = font_sizes(size)
+        preload_fonts([TEXT_FONTS], [text_size])
+        preload_fonts([NAME_FONTS], [name_size])
+
+def _render_job(job_id, body, author, output_dir, encoding, fit, wrap):
+    start = time.perf_counter()
+    lang = detect_language(body)
+    # Outputs are named by content hash, so duplicate quotes render once
+    outputs = make_plan(_renderer, body, author, lang, fit=fit, wrap=wrap).save_all(output_dir, SIZES, encoding)
+    return {
+        'id': job_id,
+        'status': 'ok',
+        'lang': lang,
+        'outputs': outputs,
+        'seconds': round(time.perf_counter() - start, 3),
+    }
+
+def render_batch(source, output_dir='output', style='grad', workers=None, max_pending=None, manifest=None,
+                 encoding=DEFAULT_ENCODING, fit=False, wrap='greedy'):
+    """Renders every quote in `source` and writes one manifest line per job.
+
+    `style` names the renderer module (grad, geo, patt or patt2) and
+    `encoding` the output codec and quality (see encode.py); `fit` sizes
+    the text of each quote to fill its canvas and `wrap` names the line
+    breaking strategy (see layout.py). At most
+    `max_pending` jobs are queued at once, so memory stays flat no matter
+    how large the corpus is. Returns a dict of job counts per status.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+    manifest = manifest or os.path.join(output_dir, 'manifest.jsonl')
+    os.makedirs(output_dir, exist_ok=True)
+
+    counts = {'ok': 0, 'error': 0}
+    pending = {}
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(style,)) as pool, \
+            open(manifest, 'w', encoding='utf-8') as out:
+
+        def write(result):
+            counts[result['status']] += 1
+            out.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+        def collect():
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                job_id = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'id': job_id, 'status': 'error', 'error': f'{type(e).__name__}: {e}'}
+                write(result)
+
+        try:
+            for job_id, body, author, error in read_corpus(source, parse_input):
+                if error:
+                    write({'id': job_id, 'status': 'error', 'error': error})
+                    continue
+                if len(pending) >= max_pending:
+                    collect()
+                pending[pool.submit(_render_job, job_id, body, author, output_dir, encoding, fit,
+                                     wrap)] = job_id
+        finally:
+            # Jobs already submitted still get their manifest lines, even if
+            # reading the corpus failed
+            while pending:
+                collect()
+
+    return counts
+
+def preflight(source, style='grad', fit=False, wrap='greedy'):
+    """Yields (job_id, problem) for every output whose text would overflow.
+
+    Only the layout is computed, nothing is rasterized, so this is cheap
+    enough to run over a whole corpus before rendering it. A record that
+    cannot be read or laid out is reported as a problem too, the same way
+    render_batch() writes it to the manifest, instead of ending the check.
+    """
+    renderer = importlib.import_module(style)
+    for job_id, body, author, error in read_corpus(source, parse_input):
+        if error:
+            yield job_id, error
+            continue
+        try:
+            # The plan's own layouts, with the same seed and fonts as a render
+            plan = make_plan(renderer, body, author, fit=fit, wrap=wrap)
+            overflows = [prefix for prefix, size in SIZES.items() if plan.layout(size).overflows]
+        except Exception as e:
+            yield job_id, f'{type(e).__name__}: {e}'
+            continue
+        for prefix in overflows:
+            yield job_id, f'text overflows the {prefix} canvas'
+
+def main():
+    parser = argparse.ArgumentParser(description='Render a quote corpus in one process pool.')
+    parser.add_argument('source', help='JSONL file or directory of quote .txt files')
+    parser.add_argument('output_dir', nargs='?', default='output')
+    parser.add_argument('--style', default='grad', help='renderer module: grad, geo, patt or patt2')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-pending', type=int, default=None)
+    parser.add_argument('--manifest', default=None)
+    parser.add_argument('--format', default='jpeg', choices=sorted(CODECS), help='output codec')
+    parser.add_argument('--quality', type=int, default=None, help="codec quality (the codec's default if unset)")
+    parser.add_argument('--target-kb', type=int, default=None,
+                        help='largest file size; the quality is searched to fit it (capped by --quality)')
+    parser.add_argument('--fit', action='store_true', help='size the text to each quote instead of the canvas')
+    parser.add_argument('--wrap', default='greedy', choices=sorted(STRATEGIES),
+                        help="line breaking; 'optimal' gives evener paragraphs, e.g. for long Tamil quotes")
+    parser.add_argument('--check', action='store_true', help='only report quotes that overflow or cannot be laid out, without rendering')
+    args = parser.parse_args()
+
+    if args.check:
+        problems = 0
+        for job_id, problem in preflight(args.source, args.style, args.fit, args.wrap):
+            print(f"{job_id}: {problem}")
+            problems += 1
+        print(f"{problems} problems found")
+        return
+
+    start = time.perf_counter()
+    target_bytes = args.target_kb * 1024 if args.target_kb else None
+    encoding = Encoding(args.format, args.quality, target_bytes)
+    counts = render_batch(args.source, args.output_dir, args.style, args.workers, args.max_pending, args.manifest,
+                          encoding, args.fit, args.wrap)
+    elapsed = time.perf_counter() - start
+    print(f"Rendered {counts['ok']} quotes ({counts['error']} failed) in {elapsed:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Generate many wallpapers in one run across a process pool.
+
+Every wallpaper gets its own seed, derived from the run seed and its
+index, so a run can be reproduced exactly (--seed) and every file name is
+unique: <style>_<run seed>_<index>.jpg (or the extension of --format).
+Workers load the wallpaper generator once and keep it warm for the whole
+run; at the end the run reports its throughput in images per second.
+
+    python farm.py 200 --style patt2 --size 3840x2160 --workers 8
+"""
+import argparse
+import importlib.util
+import os
+import random
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+BIN_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BIN_DIR))  # status-creator modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(BIN_DIR)), 'shared'))  # shared modules
+from encode import CODECS, Encoding, save
+from palettes import PALETTES, color_palette
+from tiles import render, render_tiled
+
+# style: (script in bin/, function returning the scene)
+GENERATORS = {
+    'wav': ('wav.py', 'wavy_art_scene'),
+    'patt2': ('patt2.py', 'wavy_background_scene'),
+    'wall': ('wall.py', 'landscape_scene'),
+}
+
+# Wallpapers are kept at a higher quality than quote cards
+WALLPAPER_ENCODING = Encoding('jpeg', 95)
+
+_generator = None
+_palette = None
+
+def load_generator(style):
+    # Loaded by path: bin/patt2.py would otherwise be shadowed by ../patt2.py
+    script, function = GENERATORS[style]
+    spec = importlib.util.spec_from_file_location(f'wallpaper_{style}', os.path.join(BIN_DIR, script))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, function)
+
+def _init_worker(style, palette):
+    global _generator, _palette
+    _generator = load_generator(style)
+    _palette = palette
+
+def _render_job(path, seed, size, tile_height, encoding):
+    options = {'palette': _palette} if _palette else {}
+    scene = _generator(*size, rng=random.Random(seed), **options)
+    if tile_height:
+        render_tiled(size, scene, path, tile_height)
+    else:
+        save(render(size, scene), path, encoding)
+    return path
+
+def generate_wallpapers(count, output_dir='wallpapers', style='wav', size=(2560, 1440), palette=None,
+                        seed=None, workers=None, max_pending=None, tile_height=None, encoding=WALLPAPER_ENCODING):
+    """Renders `count` wallpapers into output_dir and returns their paths.
+
+    `palette` names a palette from palettes.py and defaults to the style's
+    own. Tiled renders (see tiles.py) are streamed to PNG, the others are
+    saved as `encoding` asks (see encode.py).
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+    seed = random.SystemRandom().getrandbits(32) if seed is None else seed
+    colors = color_palette(palette) if palette else None
+    extension = '.png' if tile_height else encoding.extension
+    os.makedirs(output_dir, exist_ok=True)
+
+    paths, pending = [], set()
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(style, colors)) as pool:
+        for index in range(count):
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            path = os.path.join(output_dir, f'{style}_{seed:08x}_{index:05d}{extension}')
+            # Per-image seed: independent of which worker picks the job up
+            pending.add(pool.submit(_render_job, path, f'{seed}:{index}', tuple(size), tile_height, encoding))
+            paths.append(path)
+        for future in pending:
+            future.result()
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate many wallpapers in one process pool.')
+    parser.add_argument('count', type=int, help='number of wallpapers')
+    parser.add_argument('output_dir', nargs='?', default='wallpapers')
+    parser.add_argument('--style', default='wav', choices=sorted(GENERATORS))
+    parser.add_argument('--size', default='2560x1440', help='canvas size, WIDTHxHEIGHT')
+    parser.add_argument('--palette', default=None, choices=sorted(PALETTES), help="defaults to the style's own")
+    parser.add_argument('--seed', type=int, default=None, help='run seed, for reproducible output')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-pending', type=int, default=None)
+    parser.add_argument('--tile-height', type=int, default=None,
+                        help='render in strips of this many rows and stream PNGs (for 4K/8K canvases)')
+    parser.add_argument('--format', default='jpeg', choices=sorted(CODECS), help='codec for untiled renders')
+    parser.add_argument('--quality', type=int, default=WALLPAPER_ENCODING.quality, help='codec quality')
+    args = parser.parse_args()
+    size = tuple(map(int, args.size.lower().split('x')))
+
+    start = time.perf_counter()
+    paths = generate_wallpapers(args.count, args.output_dir, args.style, size, args.palette,
+                                args.seed, args.workers, args.max_pending, args.tile_height,
+                                Encoding(args.format, args.quality))
+    elapsed = time.perf_counter() - start
+    print(f"Generated {len(paths)} wallpapers in {elapsed:.1f}s ({len(paths) / elapsed:.2f} images/sec)")
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,10 @@
+import os
 import random
+import sys
 from PIL import Image, ImageDraw
 from datetime import datetime
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'shared'))  # shared modules
+from encode import Encoding, save
 
 # Canvas size (can be changed)
 WIDTH, HEIGHT = 2560, 1440
@@ -68,7 +72,7 @@ def generate_geometric_art(width, height, max_shapes=5):
     final_image = image.convert('RGB')
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"geometric_art_{timestamp}.jpg"
-    final_image.save(filename, "JPEG", quality=95)
+    save(final_image, filename, Encoding('jpeg', 95))
     print(f"Saved: {filename}")
 
 if __name__ == "__main__":
@@ -1,68 +1,89 @@
-import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
+"""Pastel landscape wallpaper: sky gradient, sun, layered hills and a path.
+
+Scene coordinates run 0-1 left to right and bottom to top, and lengths
+are fractions of the canvas height so the sun stays round at any size.
+"""
+import argparse
+import os
 import random
+import sys
 from datetime import datetime
 
-# Fixed pastel color palette (converted to 0–1 scale)
-PASTEL_COLORS = [
-    (62/255, 33/255, 97/255), (137/255, 79/255, 166/255),
-    (203/255, 78/255, 145/255), (245/255, 121/255, 148/255),
-    (246/255, 132/255, 178/255), (244/255, 98/255, 108/255),
-    (182/255, 97/255, 184/255), (71/255, 88/255, 153/255),
-    (110/255, 98/255, 157/255)
-]
+import numpy as np
+
+if __name__ == "__main__":  # importers have set up sys.path already
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # status-creator modules
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'shared'))  # shared modules
+
+from encode import save
+from palettes import color_palette
+from tiles import Disc, Gradient, Polygon, Stroke, render, render_tiled
+
+# Canvas settings
+WIDTH, HEIGHT = 2560, 1440
 
-def choose_color():
-    return random.choice(PASTEL_COLORS)
+# Fixed pastel color palette (RGB)
+PASTEL_COLORS = color_palette('dusk')
 
-def draw_layered_hills(ax, num_layers=6, height_variation=0.1):
+def choose_color(rng=random, palette=PASTEL_COLORS):
+    return rng.choice(palette)
+
+def to_pixels(x, y, width, height):
+    return np.column_stack([x * width, (1 - y) * height])
+
+def layered_hills(width, height, num_layers=6, height_variation=0.1, rng=random, palette=PASTEL_COLORS):
     base_y = 0.3
+    hills = []
     for i in range(num_layers):
-        color = choose_color()
+        color = choose_color(rng, palette)
         y_offset = base_y + i * 0.05
         x = np.linspace(0, 1, 500)
         y = np.sin(x * 5 + i) * height_variation + y_offset
         y = np.clip(y, 0, 1)
-        ax.fill_between(x, y, y2=0, color=color, zorder=5 + i)
-
-def draw_sky_gradient(ax):
-    top = choose_color()
-    bottom = choose_color()
-    for i in range(100):
-        r = i / 100
-        color = r * np.array(top) + (1 - r) * np.array(bottom)
-        ax.fill_between([0, 1], 1 - r * 0.5, 1 - r * 0.5 + 0.01, color=color, zorder=0)
-
-def draw_sun(ax):
-    sun_color = choose_color()
-    sun = patches.Circle((0.75, 0.72), 0.12, color=sun_color, zorder=3)
-    ax.add_patch(sun)
-
-def draw_path(ax):
-    path_color = choose_color()
+        # Fill down to the bottom edge
+        outline = np.vstack([to_pixels(x, y, width, height), [(width, height), (0, height)]])
+        hills.append(Polygon(outline, color))
+    return hills
+
+def sky_gradient(rng=random, palette=PASTEL_COLORS):
+    top = choose_color(rng, palette)
+    bottom = choose_color(rng, palette)
+    # From `bottom` at the top edge to `top` halfway down, where the hills take over
+    return Gradient([(0, bottom), (0.5, top), (1, top)])
+
+def sun(width, height, rng=random, palette=PASTEL_COLORS):
+    sun_color = choose_color(rng, palette)
+    return Disc((0.75 * width, (1 - 0.72) * height), 0.12 * height, sun_color)
+
+def path(width, height, rng=random, palette=PASTEL_COLORS):
+    path_color = choose_color(rng, palette)
     t = np.linspace(0, 1, 500)
-    x = t
     y = 0.15 + 0.05 * np.sin(t * 6)
-    ax.plot(x, y, color=path_color, linewidth=10, zorder=10)
+    return Stroke(to_pixels(t, y, width, height), 0.02 * height, path_color)
 
-def draw_scene(save_path='generated_pastel_landscape'):
-    fig, ax = plt.subplots(figsize=(12.8, 7.2), dpi=200)  # 2560x1440
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0, 1)
-    ax.set_aspect('equal')  # Ensure circles are perfect
-    ax.axis('off')
+def landscape_scene(width, height, rng=random, palette=PASTEL_COLORS):
+    """Returns the tiles.py layers of one wallpaper."""
+    scene = [sky_gradient(rng, palette), sun(width, height, rng, palette)]  # Sun first so hills can overlap it
+    scene += layered_hills(width, height, rng=rng, palette=palette)
+    scene.append(path(width, height, rng, palette))
+    return scene
 
-    draw_sky_gradient(ax)
-    draw_sun(ax)  # Draw sun first so hills can overlap it
-    draw_layered_hills(ax)
-    draw_path(ax)
+def draw_scene(save_path='generated_pastel_landscape', width=WIDTH, height=HEIGHT, tile_height=None):
+    scene = landscape_scene(width, height)
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"{save_path}_{timestamp}.png"
-    plt.savefig(filename, bbox_inches='tight', pad_inches=0)
-    plt.close()
+    if tile_height:
+        render_tiled((width, height), scene, filename, tile_height)
+    else:
+        save(render((width, height), scene), filename)
     print(f"Image saved as {filename}")
 
-draw_scene()
-
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', default=f'{WIDTH}x{HEIGHT}', help='canvas size, WIDTHxHEIGHT')
+    parser.add_argument('--tile-height', type=int, default=None,
+                        help='render in strips of this many rows and stream the PNG (for 4K/8K canvases)')
+    args = parser.parse_args()
+    width, height = map(int, args.size.lower().split('x'))
+    draw_scene(width=width, height=height, tile_height=args.tile_height)
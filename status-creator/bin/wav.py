@@ -1,46 +1,67 @@
+"""Layered sine-wave wallpaper."""
+import argparse
 import math
+import os
 import random
+import sys
 from datetime import datetime
-from PIL import Image, ImageDraw
+
+if __name__ == "__main__":  # importers have set up sys.path already
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # status-creator modules
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'shared'))  # shared modules
+
+from encode import Encoding, save
+from palettes import color_palette
+from tiles import Fill, Polygon, render, render_tiled
 
 # Canvas settings
 WIDTH, HEIGHT = 2560, 1440
 
 # Pastel colors
-PASTEL_COLORS = [
-    (62, 33, 97), (137, 79, 166), (203, 78, 145),
-    (245, 121, 148), (246, 132, 178), (244, 98, 108),
-    (182, 97, 184), (71, 88, 153), (110, 98, 157)
-]
+PASTEL_COLORS = color_palette('dusk')
 
-def draw_wave(draw, y_offset, amplitude, frequency, phase, color, height, width):
+def wave_layer(y_offset, amplitude, frequency, phase, color, height, width):
     points = []
     for x in range(0, width + 10, 5):
         y = y_offset + amplitude * math.sin(frequency * x + phase)
         points.append((x, y))
     # Close the shape down to the bottom
     points += [(width, height), (0, height)]
-    draw.polygon(points, fill=color)
+    return Polygon(points, color)
 
-def generate_wavy_art(width=1000, height=1000, layers=5):
-    bg_color = tuple(random.randint(240, 255) for _ in range(3))
-    image = Image.new("RGB", (width, height), bg_color)
-    draw = ImageDraw.Draw(image)
+def wavy_art_scene(width, height, layers=5, rng=random, palette=PASTEL_COLORS):
+    """Returns the tiles.py layers of one wallpaper."""
+    bg_color = tuple(rng.randint(240, 255) for _ in range(3))
+    scene = [Fill(bg_color)]
 
     base_y = height // 2
     for i in range(layers):
-        amp = random.uniform(20, 80)
-        freq = random.uniform(0.005, 0.02)
-        phase = random.uniform(0, 2 * math.pi)
-        y_offset = base_y + (i - layers // 2) * 60 + random.randint(-30, 30)
-        color = random.choice(PASTEL_COLORS)
-        draw_wave(draw, y_offset, amp, freq, phase, color, height, width)
+        amp = rng.uniform(20, 80)
+        freq = rng.uniform(0.005, 0.02)
+        phase = rng.uniform(0, 2 * math.pi)
+        y_offset = base_y + (i - layers // 2) * 60 + rng.randint(-30, 30)
+        color = rng.choice(palette)
+        scene.append(wave_layer(y_offset, amp, freq, phase, color, height, width))
+    return scene
+
+def generate_wavy_art(width=1000, height=1000, layers=5, tile_height=None):
+    scene = wavy_art_scene(width, height, layers)
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"wavy_art_{timestamp}.jpg"
-    image.save(filename, "JPEG", quality=95)
+    if tile_height:
+        # Strip by strip, so memory is bounded by the strip and not the canvas
+        filename = f"wavy_art_{timestamp}.png"
+        render_tiled((width, height), scene, filename, tile_height)
+    else:
+        filename = f"wavy_art_{timestamp}.jpg"
+        save(render((width, height), scene), filename, Encoding('jpeg', 95))
     print(f"Saved: {filename}")
 
 if __name__ == "__main__":
-    generate_wavy_art(WIDTH, HEIGHT)
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', default=f'{WIDTH}x{HEIGHT}', help='canvas size, WIDTHxHEIGHT')
+    parser.add_argument('--tile-height', type=int, default=None,
+                        help='render in strips of this many rows and stream a PNG (for 4K/8K canvases)')
+    args = parser.parse_args()
+    generate_wavy_art(*map(int, args.size.lower().split('x')), tile_height=args.tile_height)
 
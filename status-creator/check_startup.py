@@ -0,0 +1,49 @@
+"""Cold-start budget check for the renderers.
+
+Imports each renderer in a fresh interpreter and fails (exit status 1) if
+any of them takes longer than the budget, so a heavy import such as
+seaborn cannot creep back into the hot path unnoticed.
+
+    python check_startup.py --budget 0.6
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+RENDERERS = ['grad', 'geo', 'patt', 'patt2', 'batch']
+SHARED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'shared')
+
+def import_time(module, runs=3):
+    """Best-of-`runs` wall time, in seconds, to import `module` cold."""
+    # Imported, not run, the renderers expect shared/ on the path already
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([SHARED_DIR, os.environ.get('PYTHONPATH', '')]))
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', f'import {module}'], check=True, env=env)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description='Check renderer cold-start times.')
+    parser.add_argument('--budget', type=float, default=0.6, help='seconds allowed per renderer')
+    parser.add_argument('modules', nargs='*', default=RENDERERS)
+    args = parser.parse_args()
+
+    baseline = import_time('sys')
+    failed = []
+    for module in args.modules:
+        elapsed = import_time(module)
+        status = 'ok' if elapsed <= args.budget else 'OVER BUDGET'
+        print(f"{module:8} {elapsed * 1000:7.0f} ms (interpreter {baseline * 1000:.0f} ms)  {status}")
+        if elapsed > args.budget:
+            failed.append(module)
+
+    if failed:
+        print(f"Over the {args.budget:.2f}s budget: {', '.join(failed)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
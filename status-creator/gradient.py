@@ -0,0 +1,82 @@
+"""Gradient backgrounds rendered straight into a NumPy buffer.
+
+A gradient is a position field (where each pixel sits along the gradient,
+0-255) looked up in a 256-entry color table. The field depends only on the
+canvas size and geometry, so it is cached and shared by every image of that
+size; the color table is cached per set of stops. Rendering an image is a
+single table lookup into a fresh RGB buffer.
+"""
+import math
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image
+
+def _linear_rows(size, angle, top, bottom):
+    width, height = size
+    theta = math.radians(angle)
+    dx, dy = math.sin(theta), math.cos(theta)  # 0 runs top to bottom, 90 left to right
+    xs = np.arange(width, dtype=np.float32) - (width - 1) / 2
+    ys = np.arange(top, bottom, dtype=np.float32) - (height - 1) / 2
+    extent = abs(dx) * (width - 1) / 2 + abs(dy) * (height - 1) / 2 or 1.0
+    t = (xs[None, :] * dx + ys[:, None] * dy) / extent  # -1 .. 1
+    return np.rint((t + 1) * 127.5).astype(np.uint8)
+
+@lru_cache(maxsize=16)
+def _linear_field(size, angle):
+    field = _linear_rows(size, angle, 0, size[1])
+    field.setflags(write=False)
+    return field
+
+@lru_cache(maxsize=16)
+def _radial_field(size, center, radius):
+    width, height = size
+    cx, cy = center[0] * (width - 1), center[1] * (height - 1)
+    reach = radius * math.hypot(width, height) / 2
+    xs = np.arange(width, dtype=np.float32) - cx
+    ys = np.arange(height, dtype=np.float32) - cy
+    t = np.sqrt(xs[None, :] ** 2 + ys[:, None] ** 2) / reach
+    field = np.rint(np.minimum(t, 1.0) * 255).astype(np.uint8)
+    field.setflags(write=False)
+    return field
+
+def _normalize_stops(stops):
+    """Accepts plain colors (evenly spaced) or (position, color) pairs."""
+    if all(len(stop) == 2 for stop in stops):
+        return tuple((float(pos), tuple(color)) for pos, color in stops)
+    last = len(stops) - 1
+    return tuple((i / last, tuple(color)) for i, color in enumerate(stops))
+
+@lru_cache(maxsize=64)
+def _color_lut(stops):
+    positions = np.array([pos for pos, _ in stops], dtype=np.float32)
+    colors = np.array([color for _, color in stops], dtype=np.float32)
+    t = np.linspace(0.0, 1.0, 256, dtype=np.float32)
+    lut = np.stack([np.interp(t, positions, colors[:, c]) for c in range(3)], axis=1)
+    lut = np.rint(lut).astype(np.uint8)
+    lut.setflags(write=False)
+    return lut
+
+def color_lut(stops):
+    """Returns the cached (256, 3) color table for a list of stops."""
+    if len(stops) < 2:
+        raise ValueError("A gradient needs at least two color stops")
+    return _color_lut(_normalize_stops(stops))
+
+def render_field(field, stops):
+    return Image.fromarray(color_lut(stops)[field], 'RGB')
+
+def linear_gradient(size, stops, angle=0):
+    """Linear gradient through `stops`; angle 0 runs top to bottom."""
+    return render_field(_linear_field(tuple(size), float(angle)), stops)
+
+def linear_gradient_rows(size, stops, top, bottom, angle=0):
+    """Rows [top, bottom) of linear_gradient(size, stops, angle), without the rest of the canvas."""
+    return render_field(_linear_rows(tuple(size), float(angle), top, bottom), stops)
+
+def radial_gradient(size, stops, center=(0.5, 0.5), radius=1.0):
+    """Radial gradient from `center` (fractions of the canvas) outwards.
+
+    `radius` is a fraction of half the canvas diagonal.
+    """
+    return render_field(_radial_field(tuple(size), tuple(center), float(radius)), stops)
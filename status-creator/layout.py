@@ -0,0 +1,197 @@
+"""Quote layout, computed without rasterizing.
+
+layout_quote() wraps the body and author, measures every line exactly once
+and works out where each line goes on the canvas. The result can be drawn
+straight onto an image or inspected on its own, e.g. to find quotes that
+overflow their canvas before committing a large batch to render.
+
+The font sizes are fixed per canvas (font_sizes()) unless auto-fit is
+asked for, in which case they are binary searched for the largest that
+fits the quote, using word widths measured once and scaled (see
+fit_font_sizes()).
+"""
+import random
+from bisect import bisect_right
+from collections import namedtuple
+from functools import lru_cache
+
+from glyphcache import draw_text, text_size
+from linebreak import word_width, wrap_text
+from script import font_at, pick_font
+
+PlacedLine = namedtuple('PlacedLine', 'text font x y width height')
+
+# Auto-fit: the quote may fill this share of the canvas height, at text
+# sizes from MIN_FIT_SIZE up to min(canvas) // MAX_FIT_DIVISOR
+FIT_HEIGHT = 0.7
+MIN_FIT_SIZE = 12
+MAX_FIT_DIVISOR = 8
+# Word widths are measured once at this size and scaled linearly
+REFERENCE_SIZE = 100
+
+def font_sizes(size):
+    """Returns (text font size, name font size, max text width) for a canvas size."""
+    if size[0] == size[1]:  # Square image (for Twitter post)
+        return size[0] // 25, size[0] // 30, size[0] * 0.75  # Adjust width for square aspect ratio
+    # Scale type with the short side so landscape canvases don't get giant text
+    short_side = min(size)
+    return short_side // 15, short_side // 22, size[0] * 0.8
+
+class QuoteLayout:
+    def __init__(self, size, lines, height, max_width):
+        self.size = size
+        self.lines = lines
+        self.height = height
+        self.max_width = max_width
+
+    @property
+    def overflows(self):
+        """True if the text is taller than the canvas or a line is too wide."""
+        return self.height > self.size[1] or any(line.width > self.max_width for line in self.lines)
+
+    def draw(self, image, fill):
+        # Lines were shaped when measured; drawing pastes the cached runs
+        for line in self.lines:
+            draw_text(image, (line.x, line.y), line.text, line.font, fill)
+
+@lru_cache(maxsize=1024)
+def _wrapped(text, font, max_width, mode='greedy'):
+    # Formats with the same width and font sizes (story, portrait) share this
+    return tuple(wrap_text(text, font, max_width, mode))
+
+def measure_lines(lines, font):
+    """Returns (width, height) for each line, as draw.textbbox would at (0, 0)."""
+    return [text_size(font, line) for line in lines]
+
+def _spacing(size):
+    """(line spacing, gap between body and author) for a canvas size."""
+    return size[1] // 80, size[1] // 25
+
+class _ScaledText:
+    """A text's word widths at REFERENCE_SIZE, for estimating its wrap at any size.
+
+    Advances scale linearly with the font size, so one shaping call per
+    distinct word serves every size the fit search tries.
+    """
+    def __init__(self, text, font):
+        reference = font_at(font, REFERENCE_SIZE)
+        self.space = word_width(reference, ' ')
+        self.widest = 0.0
+        self.paragraphs = []
+        for paragraph in text.split('\n'):
+            offsets = [0.0]
+            for word in paragraph.split():
+                width = word_width(reference, word)
+                self.widest = max(self.widest, width)
+                offsets.append(offsets[-1] + width + self.space)
+            self.paragraphs.append(offsets)
+        ascent, descent = reference.getmetrics()
+        self.line_height = ascent + descent
+
+    def line_count(self, font_size, max_width):
+        """Lines a greedy wrap at `font_size` takes (see linebreak._greedy), kerning aside."""
+        limit = max_width * REFERENCE_SIZE / font_size
+        count = 0
+        for offsets in self.paragraphs:
+            n = len(offsets) - 1
+            if n == 0:  # empty lines are kept
+                count += 1
+            i = 0
+            while i < n:
+                i = max(bisect_right(offsets, offsets[i] + self.space + limit, i + 1) - 1, i + 1)
+                count += 1
+        return count
+
+    def height(self, font_size, max_width, line_spacing):
+        lines = self.line_count(font_size, max_width)
+        return lines * self.line_height * font_size / REFERENCE_SIZE + line_spacing * (lines - 1)
+
+    def fits_width(self, font_size, max_width):
+        return self.widest * font_size / REFERENCE_SIZE <= max_width
+
+def _name_size(size, text_size):
+    # The author keeps the proportion font_sizes() gives it to the body
+    fixed_text_size, fixed_name_size, _ = font_sizes(size)
+    return max(1, round(text_size * fixed_name_size / fixed_text_size))
+
+def fit_font_sizes(size, body, author, text_font, name_font, max_width, height):
+    """Largest (text size, name size) whose estimated layout fits max_width x height.
+
+    Binary searches sizes from MIN_FIT_SIZE to min(size) // MAX_FIT_DIVISOR
+    on word widths scaled from REFERENCE_SIZE, so the search shapes no text
+    beyond the first measurement of each word.
+    """
+    line_spacing, gap_between = _spacing(size)
+    body_text, author_text = _ScaledText(body, text_font), _ScaledText(author, name_font)
+
+    def fits(text_size):
+        name_size = _name_size(size, text_size)
+        if not (body_text.fits_width(text_size, max_width) and author_text.fits_width(name_size, max_width)):
+            return False
+        return (body_text.height(text_size, max_width, line_spacing) + gap_between
+                + author_text.height(name_size, max_width, line_spacing)) <= height
+
+    low, high = MIN_FIT_SIZE, max(MIN_FIT_SIZE, min(size) // MAX_FIT_DIVISOR)
+    best = MIN_FIT_SIZE
+    while low <= high:
+        middle = (low + high) // 2
+        if fits(middle):
+            best, low = middle, middle + 1
+        else:
+            high = middle - 1
+    return best, _name_size(size, best)
+
+def layout_quote(size, body, author, text_fonts, name_fonts, rng=random, lang='en', fit=False, wrap='greedy'):
+    """Lays out a quote; the fonts are lists of paths or {script: [paths]} tables.
+
+    With tables, text mixing Tamil and English gets a font per script run
+    (see script.py); `lang` picks the font for text with no letters at all.
+
+    By default the font sizes come from font_sizes(). With `fit`, they are
+    the largest at which the whole quote fills at most FIT_HEIGHT of the
+    canvas, so short quotes grow and long ones shrink instead of overflowing.
+
+    `wrap` is a linebreak.STRATEGIES name: 'greedy', or 'optimal' for
+    evener paragraphs, which suits long Tamil quotes.
+    """
+    text_size, name_size, max_text_width = font_sizes(size)
+    text_font = pick_font(body, text_fonts, text_size, rng, lang)
+    name_font = pick_font(author, name_fonts, name_size, rng, lang)
+    if not fit:
+        return _place(size, body, author, text_font, name_font, max_text_width, wrap)
+
+    height = size[1] * FIT_HEIGHT
+    text_size, name_size = fit_font_sizes(size, body, author, text_font, name_font, max_text_width, height)
+    # The estimate wraps greedily and ignores kerning and real line boxes,
+    # so check the real layout and step down in case it came out too big
+    while True:
+        layout = _place(size, body, author, font_at(text_font, text_size), font_at(name_font, name_size),
+                        max_text_width, wrap)
+        if text_size <= MIN_FIT_SIZE or (layout.height <= height and not layout.overflows):
+            return layout
+        text_size -= 1
+        name_size = _name_size(size, text_size)
+
+def _place(size, body, author, text_font, name_font, max_text_width, wrap='greedy'):
+    line_spacing, gap_between = _spacing(size)
+
+    blocks = []
+    for text, font in ((body, text_font), (author, name_font)):
+        lines = _wrapped(text, font, max_text_width, wrap)
+        blocks.append((lines, font, measure_lines(lines, font)))
+
+    def text_height(metrics):
+        return sum(h for _, h in metrics) + line_spacing * (len(metrics) - 1)
+
+    total_height = text_height(blocks[0][2]) + gap_between + text_height(blocks[1][2])
+    current_y = (size[1] - total_height) // 2
+
+    placed = []
+    for n, (lines, font, metrics) in enumerate(blocks):
+        if n:
+            current_y += gap_between
+        for line, (w, h) in zip(lines, metrics):
+            placed.append(PlacedLine(line, font, (size[0] - w) // 2, current_y, w, h))
+            current_y += h + line_spacing
+
+    return QuoteLayout(size, placed, total_height, max_text_width)
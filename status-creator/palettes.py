@@ -0,0 +1,43 @@
+"""Static copies of the seaborn palettes the renderers use.
+
+Importing seaborn drags in pandas and matplotlib just to read ten colors,
+which dominated the start-up time of every script, so the values are kept
+here instead (seaborn's "deep", "muted" and "pastel", as 0-255 RGB).
+
+The wallpaper scripts in bin/ keep their palettes here too, so the
+wallpaper farm can mix any style with any palette: "dusk" (wav.py,
+wall.py) and "ocean" (patt2.py).
+"""
+
+def _hex(*codes):
+    return [tuple(int(code[i:i + 2], 16) for i in (1, 3, 5)) for code in codes]
+
+PALETTES = {
+    'deep': _hex("#4C72B0", "#DD8452", "#55A868", "#C44E52", "#8172B3",
+                 "#937860", "#DA8BC3", "#8C8C8C", "#CCB974", "#64B5CD"),
+    'muted': _hex("#4878D0", "#EE854A", "#6ACC64", "#D65F5F", "#956CB4",
+                  "#8C613C", "#DC7EC0", "#797979", "#D5BB67", "#82C6E2"),
+    'pastel': _hex("#A1C9F4", "#FFB482", "#8DE5A1", "#FF9F9B", "#D0BBFF",
+                   "#DEBB9B", "#FAB0E4", "#CFCFCF", "#FFFEA3", "#B9F2F0"),
+    'dusk': [(62, 33, 97), (137, 79, 166), (203, 78, 145),
+             (245, 121, 148), (246, 132, 178), (244, 98, 108),
+             (182, 97, 184), (71, 88, 153), (110, 98, 157)],
+    'ocean': [
+        (17, 42, 53),     # Deep Teal
+        (68, 87, 104),    # Slate Blue-Green
+        (193, 103, 88),   # Warm Coral
+        (12, 26, 34),     # Midnight Blue
+        (34, 73, 91),     # Ocean Slate
+        (244, 147, 97),   # Sunset Peach
+        (103, 120, 121),  # Steel Gray
+        (124, 161, 161),  # Soft Aqua
+        (46, 52, 59),     # Charcoal Teal
+    ],
+}
+
+def color_palette(name):
+    """Returns the named palette as a list of (r, g, b) tuples."""
+    try:
+        return list(PALETTES[name])
+    except KeyError:
+        raise ValueError(f"Unknown palette: {name}") from None
@@ -0,0 +1,183 @@
+"""Render one quote to every social format in a single pass.
+
+A RenderPlan fixes everything that should not change between formats (the
+random seed that drives the background and font choice, the fonts, the
+fill) once per quote, then renders each target size from it. Formats that
+share an aspect ratio are rendered once at the largest size and scaled
+down, and layouts are cached per size, so e.g. the story and its thumbnail
+cost one background and one text layout between them.
+
+Rendering is deterministic: the seed is derived from a hash of the quote
+and the style, and output files are named after a hash of every render
+input (quote, style, language, layout mode) plus the canvas size and
+encoding. save_all() skips any output that already exists, so asking for
+the same quote again costs nothing, and encodes on a background thread
+(see encode.py) while the next format renders.
+
+The renderer scripts (grad, geo, patt, patt2) only define their style: a
+STYLE name, a TEXT_FILL and render_background(size, rng). make_plan(),
+create_image() and main() take the renderer module and do the rest.
+"""
+import hashlib
+import json
+import math
+import os
+import random
+
+from PIL import Image
+
+from encode import DEFAULT_ENCODING, BackgroundEncoder, save
+from layout import layout_quote
+from script import detect_language
+
+# Bump when a renderer change should invalidate previously cached outputs:
+#   2  patt2 wave outlines sampled adaptively (spline.py)
+#   3  geo, patt and patt2 shapes filled with anti-aliased coverage (raster.py)
+#   4  fonts picked per script run (script.py)
+RENDER_VERSION = 4
+
+# Fonts per script, shared by every renderer
+TEXT_FONTS = {
+    'en': ['Inter.ttf', 'Inter.ttf'],
+    'ta': ['Notoserif.ttf', 'Notoserif.ttf']
+}
+NAME_FONTS = {
+    'en': ['Inria.ttf', 'Inria.ttf'],
+    'ta': ['Tiro.ttf', 'Tiro.ttf']
+}
+
+FORMATS = {
+    'wa': (1080, 1920),         # WhatsApp Status / story
+    'sq': (1080, 1080),         # Twitter Square
+    'portrait': (1080, 1350),   # 4:5 feed post
+    'landscape': (1920, 1080),  # 16:9
+    'thumb': (540, 960),        # story thumbnail
+}
+
+def aspect_ratio(size):
+    divisor = math.gcd(*size)
+    return size[0] // divisor, size[1] // divisor
+
+def quote_seed(body, author, style):
+    """Seed of a quote's background and font choice, the same for every layout mode."""
+    payload = json.dumps([RENDER_VERSION, style, body, author], ensure_ascii=False)
+    return int(hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16], 16)
+
+def quote_key(body, author, style, lang, fit, wrap):
+    """Content hash of every input that affects how a quote renders."""
+    payload = json.dumps([RENDER_VERSION, style, body, author, lang, fit, wrap], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class RenderPlan:
+    def __init__(self, body, author, background, text_fonts, name_fonts, fill, style, seed=None, lang='en', fit=False,
+                 wrap='greedy'):
+        self.body = body
+        self.author = author
+        self.background = background
+        self.text_fonts = text_fonts
+        self.name_fonts = name_fonts
+        self.fill = fill
+        self.lang = lang
+        self.fit = fit
+        self.wrap = wrap
+        self.key = quote_key(body, author, style, lang, fit, wrap)
+        self.seed = quote_seed(body, author, style) if seed is None else seed
+        self._layouts = {}
+
+    def output_path(self, output_dir, name, size, encoding=DEFAULT_ENCODING):
+        """Cache path of one format: changes whenever the quote key, seed, size or encoding do."""
+        ident = f'{self.key}:{self.seed}:{size[0]}x{size[1]}:{encoding.format}:{encoding.quality}:{encoding.target_bytes}'
+        digest = hashlib.sha256(ident.encode('ascii')).hexdigest()
+        return os.path.join(output_dir, f'{name}_{digest[:20]}{encoding.extension}')
+
+    def layout(self, size):
+        """Returns the (cached) QuoteLayout for a canvas size, without rasterizing."""
+        size = tuple(size)
+        if size not in self._layouts:
+            self._layouts[size] = layout_quote(size, self.body, self.author, self.text_fonts,
+                                               self.name_fonts, rng=random.Random(self.seed), lang=self.lang,
+                                               fit=self.fit, wrap=self.wrap)
+        return self._layouts[size]
+
+    def render(self, size):
+        size = tuple(size)
+        img = self.background(size, random.Random(self.seed))
+        self.layout(size).draw(img, fill=self.fill)
+        return img if img.mode == 'RGB' else img.convert('RGB')
+
+    def iter_renders(self, formats=FORMATS, names=None):
+        """Yields (name, image) for every format, sharing renders where the aspect ratio allows.
+
+        Each aspect ratio group is rendered at its largest size and the rest
+        scaled from that, so a format always comes out the same whichever
+        others are asked for. `names` limits the formats yielded (all by
+        default) without changing how they are derived.
+        """
+        groups = {}
+        for name, size in formats.items():
+            groups.setdefault(aspect_ratio(size), []).append((name, tuple(size)))
+
+        for members in groups.values():
+            wanted = [(name, size) for name, size in members if names is None or name in names]
+            if not wanted:
+                continue
+            master_size = max(size for _, size in members)
+            master = self.render(master_size)
+            for name, size in wanted:
+                yield name, master if size == master.size else master.resize(size, Image.Resampling.LANCZOS)
+
+    def render_all(self, formats=FORMATS):
+        """Returns {name: image} for every format."""
+        return dict(self.iter_renders(formats))
+
+    def save_all(self, output_dir, formats=FORMATS, encoding=DEFAULT_ENCODING):
+        """Saves every format under output_dir and returns {name: path}.
+
+        Formats whose file already exists are returned without rendering.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        paths = {name: self.output_path(output_dir, name, size, encoding) for name, size in formats.items()}
+        missing = [name for name, path in paths.items() if not os.path.exists(path)]
+        # Files are written under a temporary name and renamed, so a crashed
+        # render never leaves a cache hit behind
+        with BackgroundEncoder(encoding) as encoder:
+            for name, img in self.iter_renders(formats, missing):
+                encoder.submit(img, paths[name])
+        return paths
+
+def parse_input(text):
+    """Splits input.txt text into (body, author) at the first blank line."""
+    parts = text.strip().split('\n\n')
+    body = parts[0]
+    author = parts[1] if len(parts) > 1 else ''
+    return body, author
+
+def make_plan(renderer, body, author, lang=None, seed=None, fit=False, wrap='greedy'):
+    """RenderPlan for a quote in the style of a renderer module.
+
+    `lang` defaults to the body's language. Fonts are picked per script
+    run, so mixed Tamil/English quotes get both. `fit` and `wrap` pick the
+    layout mode (see layout_quote()).
+    """
+    lang = lang or detect_language(body)
+    return RenderPlan(body, author, renderer.render_background, TEXT_FONTS, NAME_FONTS, renderer.TEXT_FILL,
+                      renderer.STYLE, seed, lang, fit, wrap)
+
+def create_image(renderer, size, body, author, lang, outname, seed=None, encoding=None, fit=False, wrap='greedy'):
+    # Codec from the file extension unless given (see encode.py); `fit`
+    # sizes the text to the quote instead of the canvas (see layout.py)
+    save(make_plan(renderer, body, author, lang, seed, fit, wrap).render(size), outname, encoding)
+
+def main(renderer):
+    with open('input.txt', 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    body, author = parse_input(content)
+
+    # Story, square, portrait, landscape and thumbnail in one pass; outputs
+    # are named by content hash, so re-running on the same quote is free
+    paths = make_plan(renderer, body, author).save_all('output')
+    for path in paths.values():
+        print(path)
+
+    print("Images generated successfully!")
@@ -0,0 +1,192 @@
+"""Anti-aliased shape filling at native resolution.
+
+PIL's draw.polygon() decides each pixel in or out, so edges stair-step,
+and the usual cure (drawing at 2-4x and downscaling) costs 4-16x the
+memory and time of the final image. fill_polygon() instead works out how
+much of every pixel the shape covers and blends the fill in by that
+fraction, straight onto the target image:
+
+* each pixel row is sampled at SAMPLES sub-scanlines;
+* every edge crossing on a sub-scanline is placed at its exact x, and the
+  pixel it falls in gets the fractional part, so coverage is exact across
+  a row and only sampled down it;
+* a running sum of the signed crossings along the row is the winding
+  number, so shapes fill with the non-zero rule, like PIL.
+
+Coverage is exact for simple polygons. Self-intersecting ones still fill,
+but pixels where oppositely wound regions meet come out too light.
+Coverage is accumulated a band of rows at a time, so the scratch memory
+stays a few megabytes whatever the canvas size.
+
+Run this module to benchmark it against supersampling:
+
+    python raster.py --size 2560x1440 --factor 4
+"""
+import math
+
+import numpy as np
+from PIL import Image
+
+SAMPLES = 16  # sub-scanlines per pixel row
+BAND = 512    # rows of coverage accumulated at once
+
+def _crossings(points, samples):
+    """Returns (sub-scanline, x, direction) of every edge crossing, sorted by sub-scanline."""
+    # PIL puts integer coordinates on pixel centres; coverage works in pixel areas
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2) + 0.5
+    x0, y0 = pts[:, 0], pts[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+    keep = y0 != y1  # horizontal edges cross no scanline
+    x0, y0, x1, y1 = x0[keep], y0[keep], x1[keep], y1[keep]
+    slope = (x1 - x0) / (y1 - y0)
+    direction = np.where(y1 > y0, 1.0, -1.0)
+
+    # Sub-scanline k samples y = (k + 0.5) / samples; an edge owns top <= y < bottom
+    first = np.ceil(np.minimum(y0, y1) * samples - 0.5).astype(np.int64)
+    last = np.ceil(np.maximum(y0, y1) * samples - 0.5).astype(np.int64)
+    counts = np.maximum(last - first, 0)
+    edge = np.repeat(np.arange(len(counts)), counts)
+    k = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + first[edge]
+    x = x0[edge] + ((k + 0.5) / samples - y0[edge]) * slope[edge]
+
+    order = np.argsort(k, kind='stable')
+    return k[order], x[order], direction[edge][order]
+
+def polygon_mask(points, size, alpha=255, samples=SAMPLES):
+    """Coverage of a polygon on a canvas of `size`, scaled to `alpha`.
+
+    Returns (box, mask): the polygon's bounding box clipped to the canvas
+    and an 8-bit mask of that box, or (None, None) if nothing is visible.
+    """
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    left = max(math.floor(pts[:, 0].min()), 0)
+    right = min(math.ceil(pts[:, 0].max()) + 1, size[0])
+    top = max(math.floor(pts[:, 1].min()), 0)
+    bottom = min(math.ceil(pts[:, 1].max()) + 1, size[1])
+    if left >= right or top >= bottom:
+        return None, None
+
+    k, x, direction = _crossings(pts, samples)
+    width = right - left
+    stride = width + 2  # room for the crossings that land on the right edge
+    mask = np.empty((bottom - top, width), dtype=np.uint8)
+
+    for band_top in range(top, bottom, BAND):
+        band_bottom = min(band_top + BAND, bottom)
+        start, stop = np.searchsorted(k, [band_top * samples, band_bottom * samples])
+        rows = k[start:stop] // samples - band_top
+        xs = np.clip(x[start:stop] - left, 0, width)
+        cells = xs.astype(np.int64)
+        frac = xs - cells
+        weight = direction[start:stop] / samples
+
+        # Each crossing turns the winding on from its x onwards: the pixel it
+        # lands in gets the uncovered fraction, the one after it the rest.
+        # The sub-scanlines of a row are summed here already; for a simple
+        # polygon they all wind the same way, so nothing cancels.
+        index = rows * stride + cells
+        cells_total = (band_bottom - band_top) * stride
+        acc = (np.bincount(index, weight * (1 - frac), cells_total) +
+               np.bincount(index + 1, weight * frac, cells_total))
+        winding = np.cumsum(acc.reshape(-1, stride)[:, :width], axis=1)
+        coverage = np.minimum(np.abs(winding), 1.0)
+        mask[band_top - top:band_bottom - top] = np.rint(coverage * alpha)
+
+    return (left, top, right, bottom), mask
+
+def fill_polygon(image, points, fill, samples=SAMPLES):
+    """Fills a polygon on `image` with anti-aliased edges.
+
+    `points` is a sequence of (x, y) pairs or a flat x, y sequence, as for
+    draw.polygon(). `fill` is an RGB or RGBA tuple; its alpha is composited
+    over what is already there, like an 'RGBA' ImageDraw.
+    """
+    alpha = fill[3] if len(fill) == 4 else 255
+    box, mask = polygon_mask(points, image.size, alpha, samples)
+    if box is None:
+        return
+    color = tuple(fill[:3]) + ((255,) if image.mode == 'RGBA' else ())
+    image.paste(color, box, Image.fromarray(mask, 'L'))
+
+def ellipse_points(box, tolerance=0.25):
+    """Polygon approximating the ellipse PIL would draw in `box`, within `tolerance` px."""
+    x0, y0, x1, y1 = box
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    # PIL's box is inclusive: the ellipse reaches the outer edge of the last pixel
+    rx, ry = (x1 - x0 + 1) / 2, (y1 - y0 + 1) / 2
+    radius = max(rx, ry, tolerance)
+    segments = max(8, math.ceil(math.pi / math.acos(max(1 - tolerance / radius, -1))))
+    theta = np.linspace(0, 2 * math.pi, segments, endpoint=False)
+    return np.column_stack([cx + rx * np.cos(theta), cy + ry * np.sin(theta)])
+
+def fill_ellipse(image, box, fill, samples=SAMPLES):
+    """Anti-aliased counterpart of draw.ellipse(box, fill=fill)."""
+    fill_polygon(image, ellipse_points(box), fill, samples)
+
+def _benchmark_shapes(width, height, rng):
+    # Roughly what the wave and geometric backgrounds draw
+    shapes = []
+    for i in range(6):
+        amp, freq, phase = rng.uniform(20, 80), rng.uniform(0.005, 0.02), rng.uniform(0, 2 * math.pi)
+        y_offset = height // 2 + (i - 3) * 60
+        points = [(x, y_offset + amp * math.sin(freq * x + phase)) for x in range(0, width + 10, 5)]
+        shapes.append((points + [(width, height), (0, height)], (rng.randrange(256), 120, 200, 255)))
+    for _ in range(4):
+        cx, cy, r = rng.uniform(0, width), rng.uniform(0, height), rng.uniform(height / 4, height)
+        angle = rng.uniform(0, 2 * math.pi)
+        points = [(cx + r * math.cos(angle + a), cy + r * math.sin(angle + a)) for a in (0, 2.1, 4.2)]
+        shapes.append((points, (200, rng.randrange(256), 150, 150)))
+    return shapes
+
+def _benchmark():
+    import argparse
+    import random
+    import time
+
+    from PIL import ImageDraw
+
+    parser = argparse.ArgumentParser(description='Compare coverage filling with supersampling.')
+    parser.add_argument('--size', default='2560x1440', help='canvas size, WIDTHxHEIGHT')
+    parser.add_argument('--factor', type=int, default=4, help='supersampling factor to compare with')
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+    width, height = map(int, args.size.lower().split('x'))
+    shapes = _benchmark_shapes(width, height, random.Random(0))
+
+    def aliased():
+        image = Image.new('RGB', (width, height), (245, 245, 245))
+        draw = ImageDraw.Draw(image, 'RGBA')
+        for points, fill in shapes:
+            draw.polygon(points, fill=fill)
+        return image, width * height * 3
+
+    def coverage():
+        image = Image.new('RGB', (width, height), (245, 245, 245))
+        for points, fill in shapes:
+            fill_polygon(image, points, fill)
+        return image, width * height * 3
+
+    def supersampled():
+        f = args.factor
+        image = Image.new('RGB', (width * f, height * f), (245, 245, 245))
+        draw = ImageDraw.Draw(image, 'RGBA')
+        for points, fill in shapes:
+            draw.polygon([(x * f + (f - 1) / 2, y * f + (f - 1) / 2) for x, y in points], fill=fill)
+        return image.resize((width, height), Image.Resampling.BOX), width * height * 3 * (f * f + 1)
+
+    results = {}
+    for name, render in (('aliased', aliased), ('coverage', coverage), (f'supersample {args.factor}x', supersampled)):
+        best = float('inf')
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            image, canvas_bytes = render()
+            best = min(best, time.perf_counter() - start)
+        results[name] = np.asarray(image, dtype=np.float32)
+        print(f"{name:16} {best * 1000:8.1f} ms  canvas {canvas_bytes / 2 ** 20:7.1f} MiB")
+
+    reference = results.pop(f'supersample {args.factor}x')
+    for name, pixels in results.items():
+        print(f"{name:16} mean |difference| from supersampled: {np.abs(pixels - reference).mean():.3f}")
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,157 @@
+"""Strip-by-strip rendering for canvases too large to hold in memory.
+
+A scene is a list of layers painted bottom to top. render_tiled() paints
+them into one horizontal strip of the canvas at a time and streams every
+finished strip into a PNG file, so peak memory is one strip plus the
+compressor's window, not the whole frame. An 8K wallpaper in 256-row
+strips needs about 6 MB of pixels instead of about 100 MB.
+
+A layer is anything with a draw(strip, top, size) method that paints
+canvas rows [top, top + strip.height) of a `size` canvas onto `strip`.
+"""
+import os
+import struct
+import zlib
+
+import numpy as np
+from PIL import Image
+
+from gradient import linear_gradient_rows
+from raster import ellipse_points, fill_polygon
+
+TILE_HEIGHT = 256
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+class Fill:
+    """Solid background."""
+    def __init__(self, color):
+        self.color = tuple(color)
+
+    def draw(self, strip, top, size):
+        strip.paste(self.color, (0, 0) + strip.size)
+
+class Gradient:
+    """Linear gradient over the whole canvas (see gradient.linear_gradient)."""
+    def __init__(self, stops, angle=0):
+        self.stops = stops
+        self.angle = angle
+
+    def draw(self, strip, top, size):
+        strip.paste(linear_gradient_rows(size, self.stops, top, top + strip.height, self.angle))
+
+class Polygon:
+    """Anti-aliased filled polygon (see raster.fill_polygon), e.g. a wave closed to the bottom."""
+    def __init__(self, points, fill):
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.fill = tuple(fill)
+        self.top, self.bottom = self.points[:, 1].min(), self.points[:, 1].max()
+
+    def draw(self, strip, top, size):
+        if self.bottom < top - 1 or self.top > top + strip.height:
+            return
+        fill_polygon(strip, self.points - (0, top), self.fill)
+
+class Disc(Polygon):
+    """Anti-aliased filled circle."""
+    def __init__(self, center, radius, fill):
+        cx, cy = center
+        # ellipse_points() takes PIL's inclusive box; this one is centred on (cx, cy)
+        box = (cx - radius + 0.5, cy - radius + 0.5, cx + radius - 0.5, cy + radius - 0.5)
+        super().__init__(ellipse_points(box), fill)
+
+class Stroke(Polygon):
+    """Polyline drawn `width` pixels wide, as the polygon outlining it.
+
+    The outline offsets every point along its normal, with flat ends and
+    no join handling, which suits smooth, densely sampled curves.
+    """
+    def __init__(self, points, width, fill):
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        tangent = np.gradient(points, axis=0)
+        normal = tangent[:, ::-1] * (-1, 1) / np.linalg.norm(tangent, axis=1, keepdims=True)
+        offset = normal * (width / 2)
+        super().__init__(np.concatenate([points + offset, (points - offset)[::-1]]), fill)
+
+class PNGWriter:
+    """Writes an 8-bit RGB PNG a band of rows at a time.
+
+    Every band is filtered, fed to one zlib stream and flushed out as an
+    IDAT chunk, so nothing but the previous row is kept between bands.
+    The file is written under a temporary name and only renamed into
+    place once complete.
+    """
+    def __init__(self, path, size, level=6):
+        self.path = path
+        self.size = tuple(size)
+        self.rows_written = 0
+        self._tmp = f'{path}.{os.getpid()}.tmp'
+        self._file = open(self._tmp, 'wb')
+        self._compressor = zlib.compressobj(level)
+        self._previous = np.zeros(self.size[0] * 3, dtype=np.uint8)
+        self._file.write(PNG_SIGNATURE)
+        # Width, height, bit depth 8, color type 2 (RGB), default compression/filter, no interlace
+        self._chunk(b'IHDR', struct.pack('>IIBBBBB', self.size[0], self.size[1], 8, 2, 0, 0, 0))
+
+    def _chunk(self, kind, data):
+        self._file.write(struct.pack('>I', len(data)))
+        self._file.write(kind)
+        self._file.write(data)
+        self._file.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(kind))))
+
+    def write(self, rows):
+        """Appends (n, width, 3) uint8 rows to the image."""
+        rows = np.asarray(rows, dtype=np.uint8).reshape(len(rows), -1)
+        if rows.shape[1] != self.size[0] * 3 or self.rows_written + len(rows) > self.size[1]:
+            raise ValueError(f"Rows of shape {rows.shape} do not fit a {self.size[0]}x{self.size[1]} PNG")
+
+        # "Up" filter: each row as its difference from the row above, which
+        # gradients and flat fills compress far better than raw pixels
+        scanlines = np.empty((len(rows), rows.shape[1] + 1), dtype=np.uint8)
+        scanlines[:, 0] = 2
+        np.subtract(rows, np.vstack([self._previous[None], rows[:-1]]), out=scanlines[:, 1:])
+        self._previous = rows[-1].copy()
+        self.rows_written += len(rows)
+
+        data = self._compressor.compress(scanlines.tobytes())
+        if data:
+            self._chunk(b'IDAT', data)
+
+    def close(self):
+        if self.rows_written != self.size[1]:
+            raise ValueError(f"PNG closed after {self.rows_written} of {self.size[1]} rows")
+        self._chunk(b'IDAT', self._compressor.flush())
+        self._chunk(b'IEND', b'')
+        self._file.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self):
+        self._file.close()
+        os.remove(self._tmp)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+def render(size, layers):
+    """Paints the whole scene into one RGB image."""
+    image = Image.new('RGB', tuple(size))
+    for layer in layers:
+        layer.draw(image, 0, size)
+    return image
+
+def render_tiled(size, layers, path, tile_height=TILE_HEIGHT):
+    """Paints the scene strip by strip straight into a PNG file at `path`."""
+    width, height = size
+    with PNGWriter(path, size) as png:
+        for top in range(0, height, tile_height):
+            strip = Image.new('RGB', (width, min(tile_height, height - top)))
+            for layer in layers:
+                layer.draw(strip, top, size)
+            png.write(np.asarray(strip))
+    return path